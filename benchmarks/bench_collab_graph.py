@@ -0,0 +1,128 @@
+"""
+Latency of Collab Circle graph traversal on a million-link graph.
+
+Run from the repository root against a migrated scratch database (rows are
+inserted into users/collab_links and removed again at the end):
+    python -m benchmarks.bench_collab_graph
+
+Generates USERS synthetic users and LINKS random canonical-pair links
+(VERIFIED_SHARE of them verified) server-side, then times
+collab_graph.neighborhood and collab_graph.shortest_path for random users
+the way GET /collabcircle/{username}/network and
+GET /collabcircle/path/{source}/{target} call them, and reports p50/p95
+against the budgets below.
+"""
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from breate_backend import collab_graph
+from breate_backend.database import engine, get_db
+
+USERS = 200_000
+LINKS = 1_000_000
+VERIFIED_SHARE = 0.9
+SAMPLES = 200
+PREFIX = "bench-graph-"
+
+# Route defaults: depth 2 / limit 100 for the network, max_depth 6 for paths
+NEIGHBORHOOD_DEPTH = 2
+NEIGHBORHOOD_LIMIT = 100
+PATH_MAX_DEPTH = 6
+
+# p95 budgets, milliseconds
+NEIGHBORHOOD_BUDGET_MS = 50
+SHORTEST_PATH_BUDGET_MS = 150
+
+
+def cleanup(conn):
+    # collab_links rows go with their users (ON DELETE CASCADE)
+    conn.execute(text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": f"{PREFIX}%"})
+
+
+def generate():
+    with engine.begin() as conn:
+        cleanup(conn)
+        conn.execute(
+            text(
+                """
+                INSERT INTO users (email, username, password)
+                SELECT :prefix || i || '@example.com', :prefix || i, 'x'
+                FROM generate_series(1, :users) AS i
+                """
+            ),
+            {"prefix": PREFIX, "users": USERS},
+        )
+        # Random pairs stored in canonical order; duplicates and self links dropped
+        conn.execute(
+            text(
+                """
+                INSERT INTO collab_links (user_a_username, user_b_username, status)
+                SELECT least(a, b COLLATE "C"), greatest(a, b COLLATE "C"),
+                       CASE WHEN random() < :verified THEN 'verified' ELSE 'pending' END
+                FROM (
+                    SELECT :prefix || (1 + floor(random() * :users)::int) AS a,
+                           :prefix || (1 + floor(random() * :users)::int) AS b
+                    FROM generate_series(1, :links)
+                ) pairs
+                WHERE a <> b
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            {"prefix": PREFIX, "users": USERS, "links": LINKS, "verified": VERIFIED_SHARE},
+        )
+        conn.execute(text("ANALYZE users"))
+        conn.execute(text("ANALYZE collab_links"))
+        return conn.execute(
+            text("SELECT count(*) FROM collab_links WHERE user_a_username LIKE :pattern"),
+            {"pattern": f"{PREFIX}%"},
+        ).scalar_one()
+
+
+def report(name: str, timings: list[float], budget_ms: float) -> None:
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95)]
+    verdict = "ok" if p95 <= budget_ms else "OVER BUDGET"
+    print(f"{name}: p50 {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms, "
+          f"max {timings[-1]:.2f} ms (budget p95 {budget_ms} ms: {verdict})")
+
+
+async def measure():
+    rng = random.Random(13)
+    user = lambda: f"{PREFIX}{rng.randint(1, USERS)}"
+
+    async for db in get_db():
+        neighborhood, reached = [], []
+        for _ in range(SAMPLES):
+            started = time.perf_counter()
+            result = await collab_graph.neighborhood(db, user(), NEIGHBORHOOD_DEPTH, NEIGHBORHOOD_LIMIT)
+            neighborhood.append((time.perf_counter() - started) * 1000)
+            reached.append(len(result))
+        report(f"neighborhood (depth {NEIGHBORHOOD_DEPTH}, limit {NEIGHBORHOOD_LIMIT})",
+               neighborhood, NEIGHBORHOOD_BUDGET_MS)
+        print(f"  users returned: median {statistics.median(reached):.0f}")
+
+        paths, hops = [], []
+        for _ in range(SAMPLES):
+            started = time.perf_counter()
+            path = await collab_graph.shortest_path(db, user(), user(), PATH_MAX_DEPTH)
+            paths.append((time.perf_counter() - started) * 1000)
+            if path is not None:
+                hops.append(len(path) - 1)
+        report(f"shortest_path (max_depth {PATH_MAX_DEPTH})", paths, SHORTEST_PATH_BUDGET_MS)
+        if hops:
+            print(f"  connected pairs: {len(hops)}/{SAMPLES}, median {statistics.median(hops):.0f} hops")
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    links = generate()
+    print(f"graph: {USERS} users, {links} links in {time.perf_counter() - started:.1f}s")
+    try:
+        asyncio.run(measure())
+    finally:
+        with engine.begin() as conn:
+            cleanup(conn)
@@ -0,0 +1,69 @@
+"""
+Payload size of realistic project-feed pages, raw vs compressed.
+
+Run from the repository root:
+    python -m benchmarks.bench_compression
+
+Bodies are rendered the way GET /projects/ renders them (ORJSONResponse
+over projection dicts) from seeded random text, so they are less
+repetitive than real feeds, and compressed with the same function
+CompressionMiddleware uses. brotli rows appear only if it is installed.
+"""
+import random
+import string
+import time
+from datetime import datetime, timedelta, timezone
+
+from breate_backend.compression import _compress, brotli
+from breate_backend.serialization import ORJSONResponse
+
+PAGE_SIZES = [20, 100, 1000]
+SETTINGS = [("gzip", 1), ("gzip", 6), ("gzip", 9)]
+if brotli is not None:
+    SETTINGS += [("br", 4), ("br", 5), ("br", 11)]
+
+
+REGIONS = ["Africa", "Europe", "Asia", "North America", "South America", "Global"]
+TYPES = ["Film", "Music", "Research", "Software", "Campaign", "Exhibition"]
+ARCHETYPES = ["Creator", "Creative", "Innovator", "Systems Thinker"]
+
+
+def page_body(rows: int, seed: int = 42) -> bytes:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(2000)]
+
+    def sentence(words: int) -> str:
+        return " ".join(rng.choices(vocabulary, k=words)).capitalize() + "."
+
+    now = datetime.now(timezone.utc)
+    items = [
+        {
+            "title": sentence(rng.randint(2, 6)),
+            "objective": " ".join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(2, 6))),
+            "project_type": rng.choice(TYPES),
+            "needed_archetypes": rng.sample(ARCHETYPES, rng.randint(1, 3)),
+            "open_roles": sentence(rng.randint(2, 8)) if rng.random() < 0.7 else None,
+            "timeline": f"{rng.randint(1, 12)} months",
+            "region": rng.choice(REGIONS),
+            "coalition_tags": rng.sample(vocabulary[:50], rng.randint(0, 3)),
+            "poster_id": rng.randint(1, 5000),
+            "id": 100000 - i,
+            "created_at": now - timedelta(seconds=rng.randint(60, 3600) * i),
+        }
+        for i in range(rows)
+    ]
+    return ORJSONResponse({"items": items, "next_cursor": None}).body
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>5} {'encoding':>9} {'raw KiB':>9} {'sent KiB':>9} {'ratio':>6} {'ms':>7}")
+    for rows in PAGE_SIZES:
+        body = page_body(rows)
+        for encoding, level in SETTINGS:
+            start = time.perf_counter()
+            compressed = _compress(body, encoding, gzip_level=level, brotli_quality=level)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(
+                f"{rows:>5} {f'{encoding}-{level}':>9} {len(body) / 1024:>9.1f} "
+                f"{len(compressed) / 1024:>9.1f} {len(body) / len(compressed):>5.1f}x {elapsed:>7.2f}"
+            )
@@ -0,0 +1,48 @@
+"""
+Argon2 micro-benchmark: hashes/sec for a grid of cost parameters.
+
+Run from the repository root:
+    python -m benchmarks.bench_hashing
+
+Each setting is measured on one thread (latency of a single login) and
+through a pool of HASH_WORKERS threads (throughput of the hashing executor).
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from argon2 import PasswordHasher
+
+from breate_backend.hashing import HASH_WORKERS
+
+# (time_cost, memory_cost KiB, parallelism)
+SETTINGS = [
+    (2, 19456, 1),   # OWASP minimum
+    (3, 65536, 4),   # argon2-cffi default / app default
+    (4, 65536, 4),
+    (3, 131072, 4),
+]
+SAMPLES = 20
+
+
+def bench(time_cost: int, memory_cost: int, parallelism: int) -> tuple[float, float]:
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hasher.hash("warm-up")
+
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        hasher.hash(f"password-{i}")
+    single = SAMPLES / (time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        start = time.perf_counter()
+        list(pool.map(hasher.hash, [f"password-{i}" for i in range(SAMPLES * HASH_WORKERS)]))
+        pooled = SAMPLES * HASH_WORKERS / (time.perf_counter() - start)
+
+    return single, pooled
+
+
+if __name__ == "__main__":
+    print(f"{'t':>3} {'m (KiB)':>9} {'p':>3} {'hashes/s (1 thread)':>21} {f'hashes/s ({HASH_WORKERS} workers)':>22}")
+    for time_cost, memory_cost, parallelism in SETTINGS:
+        single, pooled = bench(time_cost, memory_cost, parallelism)
+        print(f"{time_cost:>3} {memory_cost:>9} {parallelism:>3} {single:>21.1f} {pooled:>22.1f}")
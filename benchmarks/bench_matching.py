@@ -0,0 +1,85 @@
+"""
+Latency of ranking creators for one project against a large user base.
+
+Run from the repository root (no database needed; DATABASE_URL must still
+be set for the imports):
+    python -m benchmarks.bench_matching
+
+Builds a matching.CreatorIndex from synthetic rows shaped like the real
+queries (users, coalition memberships, verified collab links), then times
+CreatorIndex.score for random projects the way GET
+/projects/{id}/suggested-creators calls it, plus one incremental update.
+"""
+import random
+import statistics
+import time
+from collections import namedtuple
+
+from breate_backend.matching import CreatorIndex
+
+USERS = 100_000
+COALITIONS = 2_000
+THEMES = 300
+PROJECTS = 200
+LIMIT = 20
+
+UserRow = namedtuple("UserRow", "id username archetype_id tier_level preferred_themes")
+
+
+def synthetic_rows(seed: int = 7):
+    rng = random.Random(seed)
+    themes = [f"theme {i}" for i in range(THEMES)]
+    users = [
+        UserRow(
+            id=i,
+            username=f"user{i}",
+            archetype_id=rng.randint(1, 4),
+            tier_level=rng.randint(1, 3),
+            preferred_themes=", ".join(rng.sample(themes, rng.randint(0, 5))),
+        )
+        for i in range(1, USERS + 1)
+    ]
+    memberships = [
+        (user_id, rng.randint(1, COALITIONS))
+        for user_id in range(1, USERS + 1)
+        for _ in range(rng.randint(0, 4))
+    ]
+    links = [
+        (f"user{rng.randint(1, USERS)}", f"user{rng.randint(1, USERS)}")
+        for _ in range(USERS * 3)
+    ]
+    return users, memberships, links, themes
+
+
+if __name__ == "__main__":
+    users, memberships, links, themes = synthetic_rows()
+
+    started = time.perf_counter()
+    index = CreatorIndex.build(users, memberships, links)
+    print(f"build: {len(index)} users, {len(memberships)} memberships, {len(links)} links "
+          f"in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(11)
+    timings = []
+    for _ in range(PROJECTS):
+        archetypes = set(rng.sample([1, 2, 3, 4], rng.randint(1, 2)))
+        tags = set(rng.sample(themes, rng.randint(0, 4)))
+        poster_id = rng.randint(1, USERS)
+        started = time.perf_counter()
+        index.score(archetypes, tags, poster_id, LIMIT)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    print(f"score: p50 {statistics.median(timings):.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms, max {timings[-1]:.2f} ms")
+
+    changed = {user.id for user in users[:100]}
+    changed_names = {f"user{user_id}" for user_id in changed}
+    rows = (
+        [user._replace(preferred_themes="theme 1, theme 2") for user in users[:100]],
+        [(user_id, coalition_id) for user_id, coalition_id in memberships if user_id in changed],
+        [(a, b) for a, b in links if a in changed_names or b in changed_names],
+    )
+    started = time.perf_counter()
+    index.update(changed, *rows)
+    print(f"incremental update of {len(changed)} users: {(time.perf_counter() - started) * 1000:.2f} ms")
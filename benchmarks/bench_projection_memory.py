@@ -0,0 +1,109 @@
+"""
+Memory per 10k-row list response: ORM hydration vs column projection.
+
+Run from the repository root against a development database (DATABASE_URL
+in .env); the sample rows are inserted inside a transaction that is rolled
+back at the end:
+    python -m benchmarks.bench_projection_memory
+
+"before" loads full ORM entities with every column (as the list routes used
+to) and converts them to response dicts; "after" is the projection path the
+routes use now (projections.columns_for + plain dicts). Peak Python heap
+is measured with tracemalloc while the response payload is built.
+"""
+import time
+import tracemalloc
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, undefer
+
+from breate_backend import models, schemas
+from breate_backend.database import engine
+from breate_backend.projections import columns_for
+from breate_backend.routers.projects import ProjectResponse
+from breate_backend.serialization import to_plain
+
+ROWS = 10_000
+LONG_TEXT = "Long-form description of goals, context and collaborators. " * 20
+
+
+def seed(session: Session) -> None:
+    archetype_id = session.scalar(select(models.Archetype.id).limit(1))
+    tier_id = session.scalar(select(models.Tier.id).limit(1))
+    session.execute(insert(models.User), [
+        {
+            "email": f"bench{i}@example.com",
+            "username": f"bench_user_{i}",
+            "password": "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 70,
+            "bio": LONG_TEXT,
+            "preferred_themes": LONG_TEXT,
+            "portfolio_links": LONG_TEXT,
+            "next_build": LONG_TEXT,
+            "affiliations": LONG_TEXT,
+            "archetype_id": archetype_id,
+            "tier_id": tier_id,
+        }
+        for i in range(ROWS)
+    ])
+    session.execute(insert(models.Project), [
+        {
+            "title": f"Bench project {i}",
+            "objective": LONG_TEXT,
+            "project_type": "Film",
+            "needed_archetypes": ["Creator"],
+            "open_roles": LONG_TEXT,
+            "region": "Africa",
+            "coalition_tags": ["bench"],
+        }
+        for i in range(ROWS)
+    ])
+    session.flush()
+
+
+def measure(fn) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed * 1000
+
+
+def run(session: Session) -> None:
+    newest_projects = select(models.Project).order_by(models.Project.id.desc()).limit(ROWS)
+    newest_users = select(models.User).order_by(models.User.id.desc()).limit(ROWS)
+
+    cases = {
+        "projects feed": (
+            lambda: to_plain(list[ProjectResponse], session.scalars(newest_projects.options(undefer("*"))).all()),
+            lambda: [dict(r) for r in session.execute(
+                select(*columns_for(ProjectResponse, models.Project)).order_by(models.Project.id.desc()).limit(ROWS)
+            ).mappings()],
+        ),
+        "coalition members": (
+            lambda: to_plain(list[schemas.UserResponse], session.scalars(newest_users.options(undefer("*"))).all()),
+            lambda: [dict(r) for r in session.execute(
+                select(*columns_for(schemas.UserResponse, models.User)).order_by(models.User.id.desc()).limit(ROWS)
+            ).mappings()],
+        ),
+    }
+
+    print(f"{'response':<18} {'before MiB':>11} {'after MiB':>10} {'before ms':>10} {'after ms':>9}")
+    for name, (before, after) in cases.items():
+        session.expunge_all()
+        before_mib, before_ms = measure(before)
+        session.expunge_all()
+        after_mib, after_ms = measure(after)
+        print(f"{name:<18} {before_mib:>11.1f} {after_mib:>10.1f} {before_ms:>10.0f} {after_ms:>9.0f}")
+
+
+if __name__ == "__main__":
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            session = Session(bind=conn)
+            seed(session)
+            run(session)
+        finally:
+            transaction.rollback()
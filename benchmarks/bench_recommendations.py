@@ -0,0 +1,61 @@
+"""
+Batch time and lookup latency of coalition recommendations.
+
+Run from the repository root (no database needed; DATABASE_URL must still
+be set for the imports):
+    python -m benchmarks.bench_recommendations
+
+Runs recommendations.compute over synthetic coalitions and memberships
+shaped like the batch queries, then times the per-user lookup the
+GET /coalitions/recommendations route does (before its filter query).
+"""
+import random
+import time
+from collections import namedtuple
+
+from breate_backend.recommendations import compute
+
+USERS = 100_000
+COALITIONS = 1_000
+TOP_K = 50
+LOOKUPS = 10_000
+
+CoalitionRow = namedtuple("CoalitionRow", "id name focus location")
+
+FOCUSES = ["Climate Change", "Innovation", "Education", "Health", "Arts", "Civic Tech", None]
+LOCATIONS = ["Global", "Africa", "Europe", "Asia", "North America", "South America", None]
+
+
+def synthetic_rows(seed: int = 3):
+    rng = random.Random(seed)
+    coalitions = [
+        CoalitionRow(i, f"Coalition {i}", rng.choice(FOCUSES), rng.choice(LOCATIONS))
+        for i in range(1, COALITIONS + 1)
+    ]
+    # Skewed popularity, like real membership
+    weights = [1 / i for i in range(1, COALITIONS + 1)]
+    memberships = {
+        (user_id, coalition_id)
+        for user_id in range(1, USERS + 1)
+        for coalition_id in rng.choices(range(1, COALITIONS + 1), weights, k=rng.randint(0, 6))
+    }
+    return coalitions, list(memberships)
+
+
+if __name__ == "__main__":
+    coalitions, memberships = synthetic_rows()
+
+    started = time.perf_counter()
+    snapshot = compute(coalitions, memberships, TOP_K)
+    print(f"batch: {len(snapshot.row_of)} users, {len(coalitions)} coalitions, "
+          f"{len(memberships)} memberships in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(5)
+    user_ids = [rng.randint(1, USERS) for _ in range(LOOKUPS)]
+    started = time.perf_counter()
+    for user_id in user_ids:
+        row = snapshot.row_of.get(user_id)
+        if row is not None:
+            list(zip(snapshot.top_ids[row].tolist(), snapshot.top_scores[row].tolist()))
+    elapsed = time.perf_counter() - started
+    print(f"lookup: {elapsed / LOOKUPS * 1e6:.1f} µs per user")
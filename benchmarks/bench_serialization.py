@@ -0,0 +1,79 @@
+"""
+Serialization micro-benchmark: rows/sec for a project feed page.
+
+Run from the repository root:
+    python -m benchmarks.bench_serialization
+
+"before" is what a route returning ORM objects with `response_model=`
+costs: FastAPI validates the content against the response field, dumps it,
+and JSONResponse renders it with the stdlib json module. "after" is the
+fast path list endpoints use now: one validation via a cached TypeAdapter
+(serialization.to_plain) rendered by ORJSONResponse. No database needed;
+rows are transient models.Project instances.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from breate_backend import models
+from breate_backend.routers.projects import ProjectPage, ProjectResponse
+from breate_backend.serialization import ORJSONResponse, to_plain
+
+PAGE_SIZES = [20, 100, 1000]
+ROUNDS = 20
+
+
+def make_projects(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        models.Project(
+            id=i,
+            title=f"Project {i}",
+            objective="Build a community studio for emerging creators. " * 4,
+            project_type="Film",
+            needed_archetypes=["Creator", "Systems Thinker"],
+            open_roles="Editor, Sound designer",
+            timeline="3 months",
+            region="Africa",
+            coalition_tags=["climate", "media"],
+            poster_id=i % 50,
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+_loop = asyncio.new_event_loop()
+
+
+def before(field, projects) -> bytes:
+    content = _loop.run_until_complete(serialize_response(
+        field=field, response_content={"items": projects, "next_cursor": None},
+    ))
+    return JSONResponse(content).body
+
+
+def after(projects) -> bytes:
+    return ORJSONResponse({"items": to_plain(list[ProjectResponse], projects), "next_cursor": None}).body
+
+
+def rows_per_sec(fn, rows: int) -> float:
+    fn()  # warm-up (builds validators / adapters)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return rows * ROUNDS / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    field = create_model_field(name="Response_get_projects", type_=ProjectPage, mode="serialization")
+    print(f"{'rows':>6} {'before rows/s':>15} {'after rows/s':>14} {'speedup':>8}")
+    for size in PAGE_SIZES:
+        projects = make_projects(size)
+        slow = rows_per_sec(lambda: before(field, projects), size)
+        fast = rows_per_sec(lambda: after(projects), size)
+        print(f"{size:>6} {slow:>15.0f} {fast:>14.0f} {fast / slow:>7.1f}x")
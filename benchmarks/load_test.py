@@ -0,0 +1,70 @@
+"""
+Concurrent load test: p50/p99 latency for read endpoints.
+
+Start the API twice, once per database stack, and run this against each:
+
+    DB_ASYNC=true  uvicorn breate_backend.main:app --port 8000
+    DB_ASYNC=false uvicorn breate_backend.main:app --port 8001
+
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8001
+
+Requires httpx (pip install httpx); it is not an app dependency.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+ENDPOINTS = [
+    "/api/v1/projects/?limit=20",
+    "/api/v1/coalitions/",
+    "/api/v1/archetypes/",
+    "/api/v1/collabcircle/user1",
+]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def client_loop(client: httpx.AsyncClient, path: str, requests: int, latencies: list, errors: list):
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run(base_url: str, clients: int, requests: int):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for path in ENDPOINTS:
+            latencies, errors = [], []
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(client_loop(client, path, requests, latencies, errors) for _ in range(clients))
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{path:<40} req/s={len(latencies) / elapsed:8.1f} "
+                f"p50={statistics.median(latencies):8.1f}ms "
+                f"p99={percentile(latencies, 99):8.1f}ms errors={len(errors)}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=10, help="requests per client per endpoint")
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.clients, args.requests))
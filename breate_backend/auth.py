@@ -4,9 +4,9 @@ from jose import jwt, JWTError, ExpiredSignatureError
 from dotenv import load_dotenv
 from fastapi import HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from breate_backend.database import get_db
-from breate_backend import models
+from breate_backend import user_cache
 
 # ------------------------------------------
 # Load environment variables
@@ -74,14 +74,14 @@ def verify_refresh_token(token: str):
 # ------------------------------------------
 # Current User Dependency
 # ------------------------------------------
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     payload = verify_access_token(token)
     email = payload.get("sub")
 
     if not email:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = await user_cache.resolve_user(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -0,0 +1,56 @@
+import os
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+
+from breate_backend.serialization import type_adapter
+
+# ------------------------------------------
+# Shared plumbing for batch write endpoints
+# ------------------------------------------
+# Batch routes validate every item up front, write all valid items in one
+# transaction, and answer with one result per input item (same order), so
+# a bad row never fails the rest of the batch.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 1000))
+
+
+def check_size(items: list) -> None:
+    if not items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Batch is empty")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch is limited to {BATCH_MAX_ITEMS} items",
+        )
+
+
+def ok(index: int, **fields) -> dict:
+    return {"index": index, "status": "ok", **fields}
+
+
+def error(index: int, code: int, detail) -> dict:
+    return {"index": index, "status": "error", "code": code, "detail": detail}
+
+
+def validate_items(schema: type[BaseModel], items: list) -> tuple[list[tuple[int, BaseModel]], dict[int, dict]]:
+    """
+    Validates each raw item against `schema`. Returns the valid
+    (index, model) pairs and a 422 result for every invalid index.
+    """
+    adapter = type_adapter(schema)
+    valid, results = [], {}
+    for index, raw in enumerate(items):
+        try:
+            valid.append((index, adapter.validate_python(raw)))
+        except ValidationError as e:
+            results[index] = error(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY,
+                e.errors(include_url=False, include_context=False),
+            )
+    return valid, results
+
+
+def summary(results: dict[int, dict], count: int) -> dict:
+    ordered = [results[index] for index in range(count)]
+    succeeded = sum(1 for result in ordered if result["status"] == "ok")
+    return {"results": ordered, "succeeded": succeeded, "failed": count - succeeded}
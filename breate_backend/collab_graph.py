@@ -0,0 +1,121 @@
+from sqlalchemy import String, any_, bindparam, case, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from breate_backend import models
+
+# ------------------------------------------
+# Traversal over verified Collab Circle links
+# ------------------------------------------
+# Links are undirected and stored once per pair (see routers/collabcircle),
+# so every hop matches either side of collab_links; both columns are indexed.
+
+links = models.CollabLink.__table__
+
+
+async def neighborhood(db: AsyncSession, username: str, depth: int, limit: int) -> list[dict]:
+    """
+    Everyone within `depth` verified hops of `username`, nearest first.
+    Runs as one recursive CTE; UNION (not UNION ALL) keeps each
+    (username, depth) pair once, so work is bounded by depth x reachable users.
+    """
+    frontier = select(
+        # varchar, to match the column type produced by the recursive term
+        cast(literal(username), String).label("username"),
+        literal(0).label("depth"),
+    ).cte("frontier", recursive=True)
+
+    neighbor = case(
+        (links.c.user_a_username == frontier.c.username, links.c.user_b_username),
+        else_=links.c.user_a_username,
+    )
+    frontier = frontier.union(
+        select(neighbor, frontier.c.depth + 1)
+        .select_from(frontier)
+        .join(
+            links,
+            or_(
+                links.c.user_a_username == frontier.c.username,
+                links.c.user_b_username == frontier.c.username,
+            ),
+        )
+        .where(links.c.status == "verified", frontier.c.depth < depth)
+    )
+
+    degree = func.min(frontier.c.depth).label("degree")
+    query = (
+        select(frontier.c.username, degree)
+        .where(frontier.c.username != username)
+        .group_by(frontier.c.username)
+        .order_by(degree, frontier.c.username)
+        .limit(limit)
+    )
+    return [dict(row) for row in (await db.execute(query)).mappings()]
+
+
+async def _expand(db: AsyncSession, usernames) -> list[tuple[str, str]]:
+    """
+    Verified links touching any of `usernames` (one indexed query per BFS
+    level). The frontier is bound as one array rather than an IN list, so a
+    wide level cannot run into the driver's 32767-parameter limit.
+    """
+    names = bindparam("names", list(usernames), type_=ARRAY(String))
+    query = select(links.c.user_a_username, links.c.user_b_username).where(
+        links.c.status == "verified",
+        or_(links.c.user_a_username == any_(names), links.c.user_b_username == any_(names)),
+    )
+    return (await db.execute(query)).all()
+
+
+async def shortest_path(db: AsyncSession, source: str, target: str, max_depth: int) -> list[str] | None:
+    """
+    Shortest chain of verified links from `source` to `target`, or None if
+    they are not connected within `max_depth` hops. Bidirectional BFS:
+    always grows the smaller frontier, one query per level.
+    """
+    if source == target:
+        return [source]
+
+    parents = ({source: None}, {target: None})
+    distances = ({source: 0}, {target: 0})
+    frontiers = ({source}, {target})
+
+    for _ in range(max_depth):
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, dist = parents[side], distances[side]
+        other = distances[1 - side]
+
+        next_frontier = set()
+        meeting = None
+        for user_a, user_b in await _expand(db, frontiers[side]):
+            for current, neighbor in ((user_a, user_b), (user_b, user_a)):
+                if current in frontiers[side] and neighbor not in seen:
+                    seen[neighbor] = current
+                    dist[neighbor] = dist[current] + 1
+                    next_frontier.add(neighbor)
+                    # Several meeting points may appear in one level: keep the closest
+                    if neighbor in other and (meeting is None or other[neighbor] < other[meeting]):
+                        meeting = neighbor
+
+        if meeting is not None:
+            return _join_path(parents[0], parents[1], meeting)
+        if not next_frontier:
+            return None
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+    return None
+
+
+def _join_path(from_source: dict, from_target: dict, meeting: str) -> list[str]:
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = from_source[node]
+    path.reverse()
+
+    node = from_target[meeting]
+    while node is not None:
+        path.append(node)
+        node = from_target[node]
+    return path
@@ -0,0 +1,183 @@
+import gzip
+import os
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+try:  # optional: `pip install brotli` enables br
+    import brotli
+except ImportError:
+    brotli = None
+
+# ------------------------------------------
+# Response compression (gzip / brotli)
+# ------------------------------------------
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 5))
+COMPRESSION_TYPES = tuple(
+    t.strip() for t in os.getenv(
+        "COMPRESSION_TYPES",
+        "application/json,text/plain,text/html,text/css,application/javascript",
+    ).split(",") if t.strip()
+)
+# Bodies larger than this are compressed on a worker thread, off the event loop
+COMPRESSION_THREAD_THRESHOLD = int(os.getenv("COMPRESSION_THREAD_THRESHOLD", 256 * 1024))
+
+ETAG_SUFFIXES = {"gzip": "-gzip", "br": "-br"}
+
+
+def _accepted_encoding(accept_encoding: str) -> str | None:
+    """Picks br, then gzip, from an Accept-Encoding header (q=0 means refused)."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    def ok(coding: str) -> bool:
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and ok("br"):
+        return "br"
+    if ok("gzip"):
+        return "gzip"
+    return None
+
+
+def _with_suffix(etag: str, suffix: str) -> str:
+    # "abc" -> "abc-gzip", W/"abc" -> W/"abc-gzip"
+    return etag[:-1] + suffix + '"' if etag.endswith('"') else etag + suffix
+
+
+def _strip_suffixes(if_none_match: str) -> tuple[str, str | None]:
+    """
+    Removes our encoding suffixes so routes compare against the identity
+    ETag. Returns the rewritten header and the first suffix seen.
+    """
+    seen = None
+    candidates = []
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        for suffix in ETAG_SUFFIXES.values():
+            if candidate.endswith(suffix + '"'):
+                candidate = candidate[: -len(suffix) - 1] + '"'
+                seen = seen or suffix
+                break
+        candidates.append(candidate)
+    return ", ".join(candidates), seen
+
+
+def _compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete (non-streaming) responses whose Content-Type is in
+    the allowlist and whose body is at least `minimum_size` bytes.
+
+    ETags stay correct per representation: a compressed body gets its ETag
+    suffixed (-gzip / -br), incoming If-None-Match values have the suffix
+    removed before routing, and a 304 echoes back the suffix the client sent.
+    Streaming responses (SSE etc.) and already-encoded bodies pass through.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        content_types: tuple[str, ...] = COMPRESSION_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = content_types
+
+    def _compressible(self, headers: Headers) -> bool:
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return any(media_type == t or (t.endswith("/") and media_type.startswith(t)) for t in self.content_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = _accepted_encoding(request_headers.get("accept-encoding", ""))
+
+        client_suffix = None
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match:
+            stripped, client_suffix = _strip_suffixes(if_none_match)
+            if client_suffix:
+                scope = dict(scope)
+                scope["headers"] = [
+                    (k, stripped.encode("latin-1") if k == b"if-none-match" else v)
+                    for k, v in scope["headers"]
+                ]
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message  # held until we see the body
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+
+            if start["status"] == 304:
+                etag = headers.get("etag")
+                if etag and client_suffix:
+                    headers["etag"] = _with_suffix(etag, client_suffix)
+                headers.add_vary_header("Accept-Encoding")
+                await send(start)
+                await send(message)
+                return
+
+            compressible = self._compressible(headers) and "content-encoding" not in headers
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+
+            if (
+                not compressible
+                or encoding is None
+                or message.get("more_body", False)  # streaming: leave untouched
+                or len(body) < self.minimum_size
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= COMPRESSION_THREAD_THRESHOLD:
+                compressed = await anyio.to_thread.run_sync(
+                    _compress, body, encoding, self.gzip_level, self.brotli_quality
+                )
+            else:
+                compressed = _compress(body, encoding, self.gzip_level, self.brotli_quality)
+
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag:
+                headers["etag"] = _with_suffix(etag, ETAG_SUFFIXES[encoding])
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
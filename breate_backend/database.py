@@ -1,8 +1,18 @@
+import asyncio
+import itertools
+import math
 import os
+import time
 from pathlib import Path
-from sqlalchemy import create_engine
+from uuid import uuid4
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 from dotenv import load_dotenv
 
 # ------------------------------------------
@@ -20,26 +30,424 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("❌ DATABASE_URL is missing! Please check your .env file in the project root.")
 
+# Routers use an AsyncSession (asyncpg). Set DB_ASYNC=false to serve them
+# from the synchronous psycopg2 engine instead (see ThreadedSession below).
+DB_ASYNC = os.getenv("DB_ASYNC", "true").lower() in ("1", "true", "yes")
+
+# ------------------------------------------
+# Connection pool settings
+# ------------------------------------------
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Recycle before Neon's idle timeout closes the connection under us
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 240))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+
+# Keep-warm: hold at least this many live connections, touching them every interval
+DB_POOL_MIN_WARM = int(os.getenv("DB_POOL_MIN_WARM", 1))
+DB_KEEP_WARM_INTERVAL = float(os.getenv("DB_KEEP_WARM_INTERVAL", 60))
+
+# PgBouncer (e.g. Neon's "-pooler" endpoint) in transaction mode cannot keep
+# server-side prepared statements across transactions. "auto" detects the
+# Neon pooler hostname.
+_pgbouncer_setting = os.getenv("DB_PGBOUNCER", "auto").lower()
+if _pgbouncer_setting == "auto":
+    DB_PGBOUNCER = "-pooler" in (make_url(DATABASE_URL).host or "")
+else:
+    DB_PGBOUNCER = _pgbouncer_setting in ("1", "true", "yes")
+
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
 # ------------------------------------------
 # Database setup
 # ------------------------------------------
 # Neon requires SSL
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"sslmode": "require"},
-    echo=False  # set to True if you want to see SQL logs
-)
+def _make_sync_engine(url: str):
+    return create_engine(
+        url,
+        connect_args={"sslmode": "require"},
+        echo=False,  # set to True if you want to see SQL logs
+        **POOL_OPTIONS,
+    )
+
+
+engine = _make_sync_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def _asyncpg_url(url: str):
+    """
+    asyncpg takes SSL as a connect argument and rejects libpq-only query
+    options such as sslmode/channel_binding, so strip them from the URL.
+    """
+    parsed = make_url(url)
+    return parsed.set(drivername="postgresql+asyncpg").difference_update_query(
+        ["sslmode", "channel_binding"]
+    )
+
+
+def _asyncpg_connect_args() -> dict:
+    connect_args = {"ssl": "require"}
+    if DB_PGBOUNCER:
+        # psycopg2 never prepares server-side; asyncpg does unless told not to
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    return connect_args
+
+
+def _make_async_engine(url: str):
+    return create_async_engine(
+        _asyncpg_url(url),
+        connect_args=_asyncpg_connect_args(),
+        echo=False,
+        **POOL_OPTIONS,
+    )
+
+
+async_engine = _make_async_engine(DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+# ------------------------------------------
+# Sync fallback with the AsyncSession call surface
+# ------------------------------------------
+class ThreadedSession:
+    """
+    Wraps a sync Session so routers can `await` it exactly like an
+    AsyncSession; each database call runs on Starlette's threadpool.
+    Only the subset of the AsyncSession API the routers use is provided.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+# ------------------------------------------
+# Read replicas
+# ------------------------------------------
+# DATABASE_REPLICA_URLS is a comma-separated list of read-only endpoints.
+# GET routes take get_read_db, which round-robins across healthy replicas;
+# writes take get_write_db (the primary). With no replicas configured both
+# hand out primary sessions.
+#
+# A replica counts as unhealthy when its health check fails, when it lags
+# more than DB_REPLICA_MAX_LAG_SECONDS behind, or when a request on it hits
+# a connection error; reads fall back to the primary until the next
+# successful check. Lag also bounds how stale a response-cache entry
+# rendered from a replica can be beyond its TTL.
+DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", 10))
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 10))
+
+# After a client's own committed write, its reads go to the primary for
+# this long (tracked with a cookie, so it also works across workers). The
+# frontend (*.vercel.app, a public suffix) is cross-site to the API, so the
+# cookie is SameSite=None; Secure and the frontend must send requests with
+# credentials. Browsers accept Secure cookies from http://localhost.
+#
+# A replica up to DB_REPLICA_MAX_LAG_SECONDS behind still serves reads, so
+# the window is never shorter than that: otherwise a client's own write
+# could vanish from its reads once the window closed. The response cache
+# uses the same window before storing replica-rendered bodies.
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", DB_REPLICA_MAX_LAG_SECONDS))
+if DB_READ_YOUR_WRITES_SECONDS < DB_REPLICA_MAX_LAG_SECONDS:
+    print(
+        f"⚠️ DB_READ_YOUR_WRITES_SECONDS={DB_READ_YOUR_WRITES_SECONDS:g} is below "
+        f"DB_REPLICA_MAX_LAG_SECONDS={DB_REPLICA_MAX_LAG_SECONDS:g}; using {DB_REPLICA_MAX_LAG_SECONDS:g}."
+    )
+    DB_READ_YOUR_WRITES_SECONDS = DB_REPLICA_MAX_LAG_SECONDS
+READ_YOUR_WRITES_COOKIE = "breate_wrote_until"
+
+# 0 when caught up (or not a standby at all). An idle primary sends no new
+# WAL, so the replay timestamp alone would report ever-growing lag.
+_REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        parsed = make_url(url)
+        self.name = f"{parsed.host or 'localhost'}/{parsed.database}"
+        self.async_engine = _make_async_engine(url)
+        self.engine = _make_sync_engine(url)
+        self.async_sessionmaker = async_sessionmaker(self.async_engine, expire_on_commit=False, autoflush=False)
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.healthy = True
+        self.lag_seconds = None
+        self.last_error = None
+        self.failures = 0
+        self.sessions = 0
+
+    def mark_down(self, reason) -> None:
+        if self.healthy:
+            print(f"⚠️ Replica {self.name} unhealthy, reading from primary:", str(reason))
+        self.healthy = False
+        self.failures += 1
+        self.last_error = str(reason)
+
+    async def check(self) -> None:
+        async def query_lag():
+            if DB_ASYNC:
+                async with self.async_engine.connect() as conn:
+                    return (await conn.execute(_REPLICA_LAG_SQL)).scalar()
+
+            def sync_query_lag():
+                with self.engine.connect() as conn:
+                    return conn.execute(_REPLICA_LAG_SQL).scalar()
+            return await run_in_threadpool(sync_query_lag)
+
+        try:
+            lag = await asyncio.wait_for(query_lag(), DB_REPLICA_CHECK_INTERVAL)
+        except asyncio.TimeoutError:
+            self.mark_down("health check timed out")
+            return
+        except Exception as e:
+            self.mark_down(e)
+            return
+
+        self.lag_seconds = float(lag or 0)
+        if self.lag_seconds > DB_REPLICA_MAX_LAG_SECONDS:
+            self.mark_down(f"{self.lag_seconds:.1f}s behind the primary")
+            return
+        if not self.healthy:
+            print(f"✅ Replica {self.name} healthy again")
+        self.healthy = True
+        self.last_error = None
+
+    def status(self) -> dict:
+        pool = self.async_engine.sync_engine.pool if DB_ASYNC else self.engine.pool
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "last_error": self.last_error,
+            "failures": self.failures,
+            "sessions": self.sessions,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+        }
+
+
+replicas = [Replica(url) for url in DATABASE_REPLICA_URLS]
+_round_robin = itertools.count()
+
+
+def _pick_replica():
+    healthy = [replica for replica in replicas if replica.healthy]
+    if not healthy:
+        return None
+    return healthy[next(_round_robin) % len(healthy)]
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def monitor_replicas() -> None:
+    """
+    Background task: re-checks every replica each DB_REPLICA_CHECK_INTERVAL,
+    taking lagging/unreachable ones out of rotation and restoring them.
+    """
+    if not replicas:
+        return
+    while True:
+        await asyncio.gather(*(replica.check() for replica in replicas))
+        await asyncio.sleep(DB_REPLICA_CHECK_INTERVAL)
+
+
+def replica_status() -> list[dict]:
+    return [replica.status() for replica in replicas]
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sets the read-your-writes cookie on responses to requests whose writer
+    session committed (get_write_db flags them in request.state).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and scope.get("state", {}).get("db_wrote"):
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={time.time() + DB_READ_YOUR_WRITES_SECONDS:.3f}; "
+                    f"Max-Age={math.ceil(DB_READ_YOUR_WRITES_SECONDS)}; Path=/; HttpOnly; Secure; SameSite=None"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
 # ------------------------------------------
-# Dependency for DB session
+# Dependencies for DB sessions
 # ------------------------------------------
-def get_db():
-    db = SessionLocal()
+def _new_session(replica=None):
+    if DB_ASYNC:
+        return (replica.async_sessionmaker if replica else AsyncSessionLocal)()
+    return ThreadedSession((replica.sessionmaker if replica else SessionLocal)(expire_on_commit=False))
+
+
+async def get_db():
+    """Primary session for code outside a request (startup, background tasks)."""
+    db = _new_session()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_write_db(request: Request):
+    """Primary session for routes that write."""
+    db = _new_session()
+
+    def mark_written(session):
+        request.state.db_wrote = True
+
+    event.listen(db.sync_session, "after_commit", mark_written)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_read_db(request: Request):
+    """
+    Replica session for GET routes; the primary when no replica is healthy
+    or the client wrote within the last DB_READ_YOUR_WRITES_SECONDS.
+    """
+    replica = None if wrote_recently(request) else _pick_replica()
+    db = _new_session(replica)
+    if replica:
+        replica.sessions += 1
+        # The response cache checks this before storing what the route renders
+        request.state.db_replica = replica.name
+    try:
+        yield db
+    except (OperationalError, InterfaceError, OSError) as e:
+        if replica:
+            replica.mark_down(e)
+        raise
+    finally:
+        await db.close()
+
+
+# ------------------------------------------
+# Pool metrics and keep-warm
+# ------------------------------------------
+def _active_pool():
+    return async_engine.sync_engine.pool if DB_ASYNC else engine.pool
+
+
+def pool_status() -> dict:
+    pool = _active_pool()
+    return {
+        "driver": "asyncpg" if DB_ASYNC else "psycopg2",
+        "pgbouncer_mode": DB_PGBOUNCER,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+async def _touch_connections(count: int) -> None:
+    """
+    Check out `count` connections at once (so they are distinct) and run a
+    trivial query on each, opening replacements for any that were dropped.
+    """
+    async def ping():
+        if DB_ASYNC:
+            async with async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        else:
+            def sync_ping():
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            await run_in_threadpool(sync_ping)
+
+    results = await asyncio.gather(*(ping() for _ in range(count)), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        print(f"⚠️ Keep-warm: {len(failures)}/{count} connections failed: {failures[0]}")
+
+
+async def keep_pool_warm() -> None:
+    """
+    Background task: keeps DB_POOL_MIN_WARM connections established so TLS
+    handshakes after idle periods do not land on the request path.
+    """
+    count = min(DB_POOL_MIN_WARM, DB_POOL_SIZE)
+    if count <= 0:
+        return
+    while True:
+        await _touch_connections(count)
+        await asyncio.sleep(DB_KEEP_WARM_INTERVAL)
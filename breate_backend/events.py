@@ -0,0 +1,163 @@
+import asyncio
+import itertools
+import os
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import orjson
+
+# ------------------------------------------
+# In-process event broker for the SSE stream
+# ------------------------------------------
+# Writers publish small events ("project.created", "collab.verified", ...).
+# Each event is encoded once as an SSE frame, kept in a bounded ring buffer
+# for Last-Event-ID resume, and handed to every matching subscriber's
+# bounded queue. A subscriber whose queue is full is disconnected instead
+# of slowing the publisher down; its client reconnects and resumes from
+# the ring buffer.
+#
+# Routes publish through invalidation.publish_event(), which fans events out
+# to every worker. With the Postgres bus each worker (the publishing one
+# included) receives events in NOTIFY order, the same everywhere, so an
+# event id means the same position on every worker and a reconnect may
+# land on any of them.
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", 1000))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", 3000))
+
+# Event ids are "<origin>-<n>", assigned by the publishing worker. An id
+# that is no longer (or never was) in the ring buffer cannot be resumed
+# from, and the client is told to resync instead of silently missing events.
+_ORIGIN = uuid.uuid4().hex[:8]
+_counter = itertools.count(1)
+
+
+def new_event_id() -> str:
+    return f"{_ORIGIN}-{next(_counter)}"
+
+
+@dataclass(frozen=True)
+class Event:
+    seq: int  # local arrival order
+    id: str
+    type: str
+    data: dict
+    frame: bytes  # encoded once, shared by every subscriber
+
+
+def _frame(event_id: str, event_type: str, data: dict) -> bytes:
+    return (
+        f"id: {event_id}\nevent: {event_type}\ndata: ".encode()
+        + orjson.dumps(data)
+        + b"\n\n"
+    )
+
+
+@dataclass(eq=False)
+class Subscriber:
+    matches: Callable[[Event], bool]
+    queue: asyncio.Queue
+    backlog: list[bytes] = field(default_factory=list)
+    dropped: bool = False
+
+
+class EventBroker:
+    def __init__(self, buffer_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self._seq = 0
+        self._buffer: deque[Event] = deque(maxlen=buffer_size)
+        self._seq_of: dict[str, int] = {}  # event id -> seq, for the buffered events
+        self._subscribers: set[Subscriber] = set()
+        self.published = 0
+        self.dropped_subscribers = 0
+        self.resets = 0
+
+    def publish(self, event_type: str, data: dict, event_id: Optional[str] = None) -> Event:
+        """Delivers to this worker's subscribers only (see invalidation.publish_event)."""
+        self._seq += 1
+        event_id = event_id or new_event_id()
+        event = Event(seq=self._seq, id=event_id, type=event_type, data=data,
+                      frame=_frame(event_id, event_type, data))
+        if len(self._buffer) == self._buffer.maxlen:
+            self._seq_of.pop(self._buffer[0].id, None)
+        self._buffer.append(event)
+        self._seq_of[event_id] = event.seq
+        self.published += 1
+
+        for subscriber in list(self._subscribers):
+            if not subscriber.matches(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+        return event
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        # Slow consumer: cut it loose; it resumes from the ring buffer on reconnect
+        subscriber.dropped = True
+        self._subscribers.discard(subscriber)
+        self.dropped_subscribers += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def _reset_frame(self, reason: str) -> bytes:
+        # Carries the newest buffered id, so the next reconnect resumes from here
+        latest = self._buffer[-1].id if self._buffer else ""
+        return _frame(latest, "reset", {"reason": reason})
+
+    def _backlog(self, last_event_id: str, matches) -> list[bytes]:
+        after = self._seq_of.get(last_event_id)
+        if after is None:
+            # Cannot replay exactly what was missed: ask the client to refetch
+            return [self._reset_frame("resume point unavailable")]
+        return [event.frame for event in self._buffer if event.seq > after and matches(event)]
+
+    def reset(self, reason: str) -> None:
+        """
+        Events may have been missed (e.g. the bus reconnected): forget the
+        buffer and tell every subscriber to refetch.
+        """
+        self._buffer.clear()
+        self._seq_of.clear()
+        self.resets += 1
+        self._seq += 1
+        event = Event(seq=self._seq, id="", type="reset", data={"reason": reason},
+                      frame=self._reset_frame(reason))
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def subscribe(self, matches: Callable[[Event], bool], last_event_id: Optional[str] = None) -> Subscriber:
+        subscriber = Subscriber(matches=matches, queue=asyncio.Queue(maxsize=self.queue_size))
+        if last_event_id:
+            subscriber.backlog = self._backlog(last_event_id, matches)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "buffered": len(self._buffer),
+            "buffer_size": self._buffer.maxlen,
+            "queue_size": self.queue_size,
+            "dropped_subscribers": self.dropped_subscribers,
+            "resets": self.resets,
+        }
+
+
+broker = EventBroker(buffer_size=EVENTS_BUFFER_SIZE, queue_size=EVENTS_QUEUE_SIZE)
+
+
+def publish(event_type: str, data: dict, event_id: Optional[str] = None) -> Event:
+    return broker.publish(event_type, data, event_id)
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+
+# ------------------------------------------
+# Load environment variables
+# ------------------------------------------
+load_dotenv()
+
+# Argon2 cost parameters (defaults match argon2-cffi's own)
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 4))
+
+# Dedicated executor: at most HASH_WORKERS hashes run at once and at most
+# HASH_QUEUE_LIMIT more may wait; beyond that callers get a 503.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", min(4, os.cpu_count() or 1)))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", 32))
+
+pwd_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM,
+)
+
+# argon2-cffi releases the GIL while hashing, so threads use every core
+# without competing with the request threadpool for the interpreter.
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="argon2")
+_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_LIMIT)
+
+
+# ------------------------------------------
+# Executor plumbing
+# ------------------------------------------
+def _submit(fn, *args) -> Future:
+    """
+    Queues `fn` on the hashing executor, or raises 503 when it is saturated.
+    """
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def _verify(password: str, hashed: str) -> tuple[bool, str | None]:
+    try:
+        pwd_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False, None
+
+    # Stored hash uses older cost parameters: upgrade it while we have the password
+    if pwd_hasher.check_needs_rehash(hashed):
+        return True, pwd_hasher.hash(password)
+    return True, None
+
+
+# ------------------------------------------
+# Public API
+# ------------------------------------------
+async def hash_password(password: str) -> str:
+    """Hash password with Argon2 on the dedicated executor."""
+    return await asyncio.wrap_future(_submit(pwd_hasher.hash, password))
+
+
+async def verify_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    Verify `password` against the stored hash on the dedicated executor.
+    Returns (matches, new_hash); new_hash is set when the stored hash should
+    be replaced because the configured cost parameters changed.
+    """
+    return await asyncio.wrap_future(_submit(_verify, password, hashed))
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+
+import asyncpg
+import orjson
+from sqlalchemy.engine import make_url
+
+from breate_backend import events, matching, reference_data, response_cache, user_cache
+from breate_backend.database import DATABASE_URL
+
+# ------------------------------------------
+# Cross-worker cache invalidation bus
+# ------------------------------------------
+# Every worker keeps its own user, response, reference-data and matching
+# caches. Write paths call invalidate_*() after committing: the change is
+# applied to this worker's caches immediately and broadcast to the others.
+# SSE events (publish_event) travel over the same bus.
+#
+#   INVALIDATION_BUS=memory    single process (default, dev/tests)
+#   INVALIDATION_BUS=postgres  LISTEN/NOTIFY on INVALIDATION_CHANNEL
+#
+# LISTEN needs a session-level connection, which a PgBouncer transaction
+# pooler cannot give: INVALIDATION_DATABASE_URL defaults to DATABASE_URL
+# with Neon's "-pooler" host suffix removed (the direct endpoint).
+INVALIDATION_BUS = os.getenv("INVALIDATION_BUS", "memory").lower()
+INVALIDATION_CHANNEL = os.getenv("INVALIDATION_CHANNEL", "breate_invalidation")
+INVALIDATION_RECONNECT_SECONDS = float(os.getenv("INVALIDATION_RECONNECT_SECONDS", 2))
+
+# NOTIFY payloads are capped at 8000 bytes; split large key lists
+_KEYS_PER_MESSAGE = 100
+# Anything still larger (event data) is sent as parts and reassembled.
+# Parts are cut from ASCII-only JSON; escaping at most doubles their size.
+_MAX_PAYLOAD = 7500
+_PART_CHARS = 3500
+
+WORKER_ID = uuid.uuid4().hex[:12]
+
+
+def _direct_url() -> str:
+    url = os.getenv("INVALIDATION_DATABASE_URL")
+    if url:
+        return url
+    parsed = make_url(DATABASE_URL)
+    if parsed.host:
+        parsed = parsed.set(host=parsed.host.replace("-pooler", ""))
+    parsed = parsed.set(drivername="postgresql").difference_update_query(["channel_binding"])
+    return parsed.render_as_string(hide_password=False)
+
+
+# ------------------------------------------
+# Applying a message to this worker's caches
+# ------------------------------------------
+def _apply(message: dict) -> None:
+    cache = message.get("cache")
+    keys = message.get("keys", [])
+    if cache == "response":
+        response_cache.invalidate(message["namespace"], *keys)
+    elif cache == "user":
+        for email in keys:
+            user_cache.invalidate(email)
+    elif cache == "matching":
+        matching.mark_dirty(*keys)
+    elif cache == "reference":
+        # No route writes archetypes/tiers; ops can trigger a reload with
+        # NOTIFY breate_invalidation, '{"cache": "reference"}'
+        asyncio.get_running_loop().create_task(reference_data.refresh_all())
+    elif cache == "event":
+        events.publish(message["type"], message["data"], message["id"])
+    elif cache == "all":
+        _clear_all()
+
+
+def _clear_all() -> None:
+    response_cache.invalidate_all()
+    user_cache.clear()
+
+
+class LagStats:
+    """Publish-to-apply delay of messages received from other workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.received = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = None
+
+    def record(self, sent_at: float) -> None:
+        lag_ms = max(0.0, (time.time() - sent_at) * 1000)
+        with self._lock:
+            self.received += 1
+            self.total_ms += lag_ms
+            self.max_ms = max(self.max_ms, lag_ms)
+            self.last_ms = lag_ms
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "received": self.received,
+                "lag_ms_avg": round(self.total_ms / self.received, 3) if self.received else None,
+                "lag_ms_max": round(self.max_ms, 3),
+                "lag_ms_last": round(self.last_ms, 3) if self.last_ms is not None else None,
+            }
+
+
+# ------------------------------------------
+# Bus implementations
+# ------------------------------------------
+class InMemoryBus:
+    """
+    Single-process bus: the local apply is all there is. Extra in-process
+    listeners (e.g. a second app instance in a test) can be attached.
+    """
+    name = "memory"
+
+    def __init__(self):
+        self.published = 0
+        self.lag = LagStats()
+        self.listeners = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, message: dict) -> bool:
+        self.published += 1
+        for listener in self.listeners:
+            listener(message)
+        return True
+
+    def stats(self) -> dict:
+        return {"bus": self.name, "worker": WORKER_ID, "published": self.published, **self.lag.as_dict()}
+
+
+class PostgresBus:
+    """
+    LISTEN/NOTIFY over one dedicated asyncpg connection per worker. A
+    supervisor task reconnects after failures; since notifications sent
+    while disconnected are lost, every reconnect clears the local caches
+    and resets the SSE subscribers.
+    """
+    name = "postgres"
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self.published = 0
+        self.send_errors = 0
+        self.reconnects = 0
+        self.lag = LagStats()
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._supervisor = None
+        self._parts: dict[tuple[str, str], list] = {}  # (origin, part id) -> chunks
+
+    async def start(self) -> None:
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+        if self._connection and not self._connection.is_closed():
+            await self._connection.close()
+
+    async def _supervise(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn, ssl="require")
+                await connection.add_listener(self.channel, self._on_notify)
+                if self.reconnects:
+                    # May have missed messages while away
+                    self._parts.clear()
+                    _clear_all()
+                    events.broker.reset("event bus reconnected")
+                self._connection = connection
+                self.reconnects += 1
+                while not connection.is_closed():
+                    await asyncio.sleep(INVALIDATION_RECONNECT_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("⚠️ Invalidation bus connection failed:", str(e))
+            self._connection = None
+            await asyncio.sleep(INVALIDATION_RECONNECT_SECONDS)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+            if "part" in message:
+                message = self._reassemble(message)
+                if message is None:
+                    return
+        except ValueError:
+            return
+        if message.get("origin") == WORKER_ID and not message.get("echo"):
+            return  # already applied when published
+        if "sent_at" in message:
+            self.lag.record(message["sent_at"])
+        _apply(message)
+
+    def _reassemble(self, part: dict):
+        key = (part["origin"], part["id"])
+        chunks = self._parts.setdefault(key, [None] * part["parts"])
+        chunks[part["part"]] = part["chunk"]
+        if any(chunk is None for chunk in chunks):
+            return None
+        del self._parts[key]
+        return json.loads("".join(chunks))
+
+    def _payloads(self, message: dict) -> list[str]:
+        payload = json.dumps(message)
+        if len(payload) <= _MAX_PAYLOAD:
+            return [payload]
+        chunks = [payload[i:i + _PART_CHARS] for i in range(0, len(payload), _PART_CHARS)]
+        part_id = uuid.uuid4().hex[:12]
+        return [
+            json.dumps({"origin": WORKER_ID, "id": part_id, "part": i, "parts": len(chunks), "chunk": chunk})
+            for i, chunk in enumerate(chunks)
+        ]
+
+    async def send(self, message: dict) -> bool:
+        connection = self._connection
+        if connection is None:
+            self.send_errors += 1
+            print("⚠️ Invalidation bus not connected; other workers rely on cache TTLs")
+            return False
+        try:
+            async with self._lock:  # one query at a time per asyncpg connection
+                for payload in self._payloads(message):
+                    await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            self.published += 1
+            return True
+        except Exception as e:
+            self.send_errors += 1
+            print("⚠️ Invalidation notify failed:", str(e))
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "bus": self.name,
+            "worker": WORKER_ID,
+            "connected": self._connection is not None and not self._connection.is_closed(),
+            "published": self.published,
+            "send_errors": self.send_errors,
+            "reconnects": max(0, self.reconnects - 1),
+            **self.lag.as_dict(),
+        }
+
+
+bus = PostgresBus(_direct_url(), INVALIDATION_CHANNEL) if INVALIDATION_BUS == "postgres" else InMemoryBus()
+
+
+# ------------------------------------------
+# API for write paths
+# ------------------------------------------
+async def _publish(message: dict) -> None:
+    _apply(message)
+    keys = message.get("keys", [])
+    chunks = [keys[i:i + _KEYS_PER_MESSAGE] for i in range(0, len(keys), _KEYS_PER_MESSAGE)] or [[]]
+    for chunk in chunks:
+        await bus.send({**message, "keys": chunk, "origin": WORKER_ID, "sent_at": time.time()})
+
+
+async def invalidate_response(namespace: str, *resource_ids) -> None:
+    await _publish({"cache": "response", "namespace": namespace, "keys": [str(r) for r in resource_ids]})
+
+
+async def invalidate_user(email: str) -> None:
+    await _publish({"cache": "user", "keys": [email]})
+
+
+async def invalidate_matching(*user_ids) -> None:
+    if user_ids:
+        await _publish({"cache": "matching", "keys": [int(u) for u in user_ids]})
+
+
+async def publish_event(event_type: str, data: dict) -> None:
+    """
+    Publishes an SSE event to the subscribers of every worker. With the
+    Postgres bus this worker also applies it only when its own NOTIFY comes
+    back, so every worker buffers events in the same order.
+    """
+    message = {
+        "cache": "event",
+        "id": events.new_event_id(),
+        "type": event_type,
+        "data": orjson.loads(orjson.dumps(data)),  # datetimes etc. as they go on the wire
+    }
+    if isinstance(bus, PostgresBus):
+        sent = await bus.send({**message, "echo": True, "origin": WORKER_ID, "sent_at": time.time()})
+        if not sent:
+            _apply(message)  # at least this worker's subscribers get it
+        return
+    await _publish(message)
+
+
+def stats() -> dict:
+    return bus.stats()
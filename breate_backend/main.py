@@ -1,10 +1,33 @@
-from fastapi import FastAPI, Depends
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+import time
+
+_boot_started = time.perf_counter()
+
+import asyncio
+import os
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from breate_backend import models
-from breate_backend.database import engine, get_db, SessionLocal
+from breate_backend import (
+    events,
+    invalidation,
+    matching,
+    recommendations,
+    reference_data,
+    response_cache,
+    user_cache,
+)
+from breate_backend.compression import CompressionMiddleware
+from breate_backend.database import (
+    DB_ASYNC,
+    ReadYourWritesMiddleware,
+    keep_pool_warm,
+    monitor_replicas,
+    pool_status,
+    replica_status,
+)
+from breate_backend.seed_data import seed_data, seed_data_async
 
 # ✅ Import all routers
 from breate_backend.routers import (
@@ -17,8 +40,15 @@ from breate_backend.routers import (
     projects,
     coalitions,
     collabcircle,  # ✅ NEW: Collab Circle routes
+    events as events_router,
 )
 
+# Skip the database round trips on the boot path (seeding, preload, pool
+# warm-up); the periodic refreshers still start
+SKIP_DB_INIT = os.getenv("BREATE_SKIP_DB_INIT", "false").lower() in ("1", "true", "yes")
+# Log a warning when import + startup hooks take longer than this
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", 2.0))
+
 app = FastAPI(
     title="Breate API",
     version="1.0.0",
@@ -44,11 +74,14 @@ app.add_middleware(
 )
 
 # ---------------------------------------
-# ✅ Database Initialization
+# ✅ Response compression (gzip, brotli when installed)
+# ---------------------------------------
+app.add_middleware(CompressionMiddleware)
+
+# ---------------------------------------
+# ✅ Read-your-writes cookie (only when read replicas are configured)
 # ---------------------------------------
-print("🛠️ Ensuring all tables exist (no data will be dropped)...")
-models.Base.metadata.create_all(bind=engine)
-print("✅ Database schema checked and up to date.")
+app.add_middleware(ReadYourWritesMiddleware)
 
 # ---------------------------------------
 # ✅ Include Routers
@@ -62,6 +95,7 @@ app.include_router(discover.router, prefix="/api/v1")
 app.include_router(projects.router, prefix="/api/v1")
 app.include_router(coalitions.router, prefix="/api/v1")
 app.include_router(collabcircle.router, prefix="/api/v1")  # ✅ NEW: Collab Circle router
+app.include_router(events_router.router, prefix="/api/v1")
 
 # ---------------------------------------
 # ✅ Root Route
@@ -75,65 +109,74 @@ def root():
 # ---------------------------------------
 @app.get("/health", tags=["Health"])
 def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "startup_seconds": getattr(app.state, "startup_seconds", None)}
 
 @app.get("/health/db", tags=["Health"])
-def check_db_connection(db: Session = Depends(get_db)):
-    try:
-        result = db.execute(text("SELECT version();"))
-        version = result.scalar()
-        return {"status": "✅ Connected", "postgres_version": version}
-    except Exception as e:
-        return {"status": "❌ Connection failed", "error": str(e)}
+def check_db_connection():
+    # Pool counters only: probes must not open connections or run queries
+    return {"status": "ok", "pool": pool_status(), "replicas": replica_status()}
+
+@app.get("/health/cache", tags=["Health"])
+def cache_stats():
+    return {
+        "user": user_cache.stats(),
+        "response": response_cache.stats(),
+        "invalidation": invalidation.stats(),
+        "matching": matching.stats(),
+        "recommendations": recommendations.stats(),
+    }
+
+@app.get("/health/events", tags=["Health"])
+def event_stats():
+    return events.broker.stats()
 
 # ---------------------------------------
-# ✅ Seed Defaults (safe, non-destructive)
+# ✅ Startup: seed defaults, then background tasks
 # ---------------------------------------
+# Schema is not touched here: run `alembic upgrade head` once per deploy.
+background_tasks: list[asyncio.Task] = []
+
+
 @app.on_event("startup")
-def seed_default_data():
-    db = SessionLocal()
-    try:
-        default_archetypes = [
-            {"name": "Creator", "description": "Visionary builders who bring ideas to life."},
-            {"name": "Creative", "description": "Expressive individuals skilled in storytelling and design."},
-            {"name": "Innovator", "description": "Thinkers who challenge norms and create new approaches."},
-            {"name": "Systems Thinker", "description": "Analytical minds who design scalable systems."},
-        ]
-        for archetype in default_archetypes:
-            if not db.query(models.Archetype).filter_by(name=archetype["name"]).first():
-                db.add(models.Archetype(**archetype))
-
-        default_tiers = [
-            {"name": "Base", "level": 1, "description": "Entry-level creators starting out."},
-            {"name": "Standard", "level": 2, "description": "Intermediate users gaining experience."},
-            {"name": "Professional", "level": 3, "description": "Experts with consistent contributions."},
-        ]
-        for tier in default_tiers:
-            if not db.query(models.Tier).filter_by(name=tier["name"]).first():
-                db.add(models.Tier(**tier))
-
-        default_coalitions = [
-            {
-                "name": "Climate Action Network",
-                "description": "A coalition focused on sustainable innovation and climate projects.",
-                "focus": "Climate Change",
-                "location": "Global",
-            },
-            {
-                "name": "Tech for Good",
-                "description": "Coalition uniting creators using technology to drive social impact.",
-                "focus": "Innovation",
-                "location": "Africa",
-            },
-        ]
-        for coalition in default_coalitions:
-            if not db.query(models.Coalition).filter_by(name=coalition["name"]).first():
-                db.add(models.Coalition(**coalition))
-
-        db.commit()
-        print("✅ Default archetypes, tiers, and coalitions seeded successfully.")
-    except Exception as e:
-        print("❌ Error seeding data:", str(e))
-    finally:
-        db.close()
+async def on_startup():
+    if SKIP_DB_INIT:
+        print("⏭️ BREATE_SKIP_DB_INIT set: skipping seeding, preload and pool warm-up.")
+    else:
+        try:
+            if DB_ASYNC:
+                await seed_data_async()
+            else:
+                await run_in_threadpool(seed_data)
+            print("✅ Default archetypes, tiers, and coalitions ensured.")
+        except Exception as e:
+            print("❌ Error seeding data:", str(e))
+        try:
+            await reference_data.refresh_all()
+        except Exception as e:
+            print("⚠️ Reference data not preloaded (loads on first request):", str(e))
+        background_tasks.append(asyncio.create_task(keep_pool_warm()))
+
+    # Periodic tasks start either way: the flag only skips work on the boot
+    # path. Without these loops the in-memory snapshots would never pick up
+    # writes and a replica marked down would never be put back in rotation.
+    background_tasks.append(asyncio.create_task(monitor_replicas()))
+    background_tasks.append(asyncio.create_task(reference_data.keep_fresh()))
+    background_tasks.append(asyncio.create_task(matching.keep_fresh()))
+    background_tasks.append(asyncio.create_task(recommendations.keep_fresh()))
+    # Listens in the background; the memory bus (default) is a no-op here
+    await invalidation.bus.start()
+
+    app.state.startup_seconds = time.perf_counter() - _boot_started
+    if app.state.startup_seconds > STARTUP_BUDGET_SECONDS:
+        print(f"⚠️ Startup took {app.state.startup_seconds:.2f}s (budget {STARTUP_BUDGET_SECONDS:.2f}s)")
+    else:
+        print(f"🚀 Startup took {app.state.startup_seconds:.2f}s")
+
 
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await invalidation.bus.stop()
@@ -0,0 +1,389 @@
+import asyncio
+import os
+import re
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import Integer, String, any_, bindparam, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from breate_backend import models, reference_data
+from breate_backend.database import get_db
+
+# ------------------------------------------
+# Project -> creator matching
+# ------------------------------------------
+# Every worker keeps a column-oriented feature index of all users (one
+# NumPy row per user), so ranking creators for a project is a handful of
+# vectorized passes instead of a query per candidate. Each score component
+# is scaled to 0..1 and weighted:
+#
+#   archetype   user's archetype is in the project's needed_archetypes
+#   tier        tier level relative to the highest level
+#   themes      share of the project's coalition_tags in preferred_themes
+#   coalitions  coalitions shared with the poster (capped)
+#   collab      1 / hops from the poster in the verified Collab Circle
+#
+# Project features are read per request (one primary-key lookup), so
+# project edits apply immediately. User-side changes arrive through
+# mark_dirty() (sent over the invalidation bus) and are folded in every
+# MATCHING_REFRESH_SECONDS; a full rebuild every MATCHING_REBUILD_SECONDS
+# catches anything else. Builds run in a worker thread from keep_fresh();
+# until the first one finishes, suggest() answers 503.
+MATCHING_REFRESH_SECONDS = float(os.getenv("MATCHING_REFRESH_SECONDS", 5))
+MATCHING_REBUILD_SECONDS = float(os.getenv("MATCHING_REBUILD_SECONDS", 3600))
+MATCHING_COLLAB_DEPTH = int(os.getenv("MATCHING_COLLAB_DEPTH", 3))
+MATCHING_MAX_RESULTS = int(os.getenv("MATCHING_MAX_RESULTS", 100))
+
+WEIGHTS = {
+    "archetype": 0.40,
+    "tier": 0.10,
+    "themes": 0.20,
+    "coalitions": 0.15,
+    "collab": 0.15,
+}
+# Sharing more coalitions than this with the poster adds nothing
+SHARED_COALITIONS_CAP = 3
+
+_TAG_SEPARATORS = re.compile(r"[,;\n]+")
+
+
+def tags_of(value) -> set[str]:
+    """Normalized tags from a comma-separated string or a list of strings."""
+    if not value:
+        return set()
+    parts = value if isinstance(value, (list, tuple, set)) else _TAG_SEPARATORS.split(value)
+    return {part.strip().lower() for part in parts if part and part.strip()}
+
+
+class CreatorIndex:
+    """
+    User features as parallel NumPy arrays indexed by row. Theme and
+    coalition postings (which rows carry a tag / belong to a coalition) are
+    kept as sets for cheap incremental updates and turned into index arrays
+    the first time a query needs them.
+    """
+
+    def __init__(self):
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.archetype_ids = np.empty(0, dtype=np.int32)
+        self.tier_levels = np.empty(0, dtype=np.float32)
+        self.active = np.empty(0, dtype=bool)
+        self.usernames: list[Optional[str]] = []
+        self.themes: list[set[str]] = []
+        self.coalitions: list[set[int]] = []
+        self.row_of: dict[int, int] = {}
+        self.row_of_username: dict[str, int] = {}
+        self.neighbors: dict[int, set[int]] = {}
+        self._postings: dict[tuple, set[int]] = {}
+        self._arrays: dict[tuple, np.ndarray] = {}
+        self.built_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    # ---- postings
+    def _post(self, kind: str, key, row: int) -> None:
+        self._postings.setdefault((kind, key), set()).add(row)
+        self._arrays.pop((kind, key), None)
+
+    def _unpost(self, kind: str, key, row: int) -> None:
+        rows = self._postings.get((kind, key))
+        if rows is not None:
+            rows.discard(row)
+            self._arrays.pop((kind, key), None)
+
+    def _repost(self, kind: str, old: set, new: set, row: int) -> None:
+        for key in old - new:
+            self._unpost(kind, key, row)
+        for key in new - old:
+            self._post(kind, key, row)
+
+    def rows_for(self, kind: str, key) -> np.ndarray:
+        array = self._arrays.get((kind, key))
+        if array is None:
+            rows = self._postings.get((kind, key), ())
+            array = np.fromiter(rows, dtype=np.int64, count=len(rows))
+            self._arrays[(kind, key)] = array
+        return array
+
+    # ---- loading
+    def _upsert_users(self, users) -> list[int]:
+        new = [user for user in users if user.id not in self.row_of]
+        if new:
+            start = len(self.user_ids)
+            self.user_ids = np.concatenate([self.user_ids, np.array([u.id for u in new], dtype=np.int64)])
+            self.archetype_ids = np.concatenate([self.archetype_ids, np.zeros(len(new), dtype=np.int32)])
+            self.tier_levels = np.concatenate([self.tier_levels, np.zeros(len(new), dtype=np.float32)])
+            self.active = np.concatenate([self.active, np.zeros(len(new), dtype=bool)])
+            for offset, user in enumerate(new):
+                self.row_of[user.id] = start + offset
+                self.usernames.append(None)
+                self.themes.append(set())
+                self.coalitions.append(set())
+
+        rows = []
+        for user in users:
+            row = self.row_of[user.id]
+            self.archetype_ids[row] = user.archetype_id or 0
+            self.tier_levels[row] = user.tier_level or 0
+            self.active[row] = True
+
+            old_username = self.usernames[row]
+            if old_username and old_username != user.username:
+                self.row_of_username.pop(old_username, None)
+            self.usernames[row] = user.username
+            if user.username:
+                self.row_of_username[user.username] = row
+
+            themes = tags_of(user.preferred_themes)
+            self._repost("theme", self.themes[row], themes, row)
+            self.themes[row] = themes
+            rows.append(row)
+        return rows
+
+    def _set_coalitions(self, rows: list[int], memberships) -> None:
+        wanted = {row: set() for row in rows}
+        for user_id, coalition_id in memberships:
+            row = self.row_of.get(user_id)
+            if row in wanted:
+                wanted[row].add(coalition_id)
+        for row, coalitions in wanted.items():
+            self._repost("coalition", self.coalitions[row], coalitions, row)
+            self.coalitions[row] = coalitions
+
+    def _set_links(self, rows: list[int], links) -> None:
+        for row in rows:
+            for other in self.neighbors.pop(row, set()):
+                self.neighbors.get(other, set()).discard(row)
+        for user_a, user_b in links:
+            row_a, row_b = self.row_of_username.get(user_a), self.row_of_username.get(user_b)
+            if row_a is None or row_b is None or row_a == row_b:
+                continue
+            self.neighbors.setdefault(row_a, set()).add(row_b)
+            self.neighbors.setdefault(row_b, set()).add(row_a)
+
+    def _deactivate(self, user_ids: Iterable[int]) -> None:
+        rows = [self.row_of[user_id] for user_id in user_ids if user_id in self.row_of]
+        for row in rows:
+            self.active[row] = False
+            self._repost("theme", self.themes[row], set(), row)
+            self._repost("coalition", self.coalitions[row], set(), row)
+            self.themes[row], self.coalitions[row] = set(), set()
+        self._set_links(rows, ())
+
+    @classmethod
+    def build(cls, users, memberships, links) -> "CreatorIndex":
+        index = cls()
+        rows = index._upsert_users(users)
+        index._set_coalitions(rows, memberships)
+        index._set_links(rows, links)
+        index.built_at = time.monotonic()
+        return index
+
+    def update(self, user_ids: set[int], users, memberships, links) -> None:
+        """Replaces the rows of `user_ids`; ids missing from `users` were deleted."""
+        self._deactivate(user_ids - {user.id for user in users})
+        rows = self._upsert_users(users)
+        self._set_coalitions(rows, memberships)
+        self._set_links(rows, links)
+
+    # ---- scoring
+    def collab_degrees(self, row: int, depth: int) -> dict[int, int]:
+        degrees = {row: 0}
+        frontier = [row]
+        for degree in range(1, depth + 1):
+            next_frontier = []
+            for current in frontier:
+                for other in self.neighbors.get(current, ()):
+                    if other not in degrees:
+                        degrees[other] = degree
+                        next_frontier.append(other)
+            frontier = next_frontier
+        del degrees[row]
+        return degrees
+
+    def score(self, archetype_ids: set[int], tags: set[str], poster_id: Optional[int], limit: int) -> list[dict]:
+        n = len(self.user_ids)
+        if n == 0:
+            return []
+
+        archetype = np.isin(self.archetype_ids, list(archetype_ids)).astype(np.float32)
+        top_level = self.tier_levels.max()
+        tier = self.tier_levels / top_level if top_level > 0 else np.zeros(n, dtype=np.float32)
+
+        themes = np.zeros(n, dtype=np.float32)
+        for tag in tags:
+            themes[self.rows_for("theme", tag)] += 1
+
+        shared = np.zeros(n, dtype=np.float32)
+        collab = np.zeros(n, dtype=np.float32)
+        degrees = {}
+        poster_row = self.row_of.get(poster_id) if poster_id is not None else None
+        if poster_row is not None:
+            for coalition_id in self.coalitions[poster_row]:
+                shared[self.rows_for("coalition", coalition_id)] += 1
+            degrees = self.collab_degrees(poster_row, MATCHING_COLLAB_DEPTH)
+            if degrees:
+                rows = np.fromiter(degrees.keys(), dtype=np.int64, count=len(degrees))
+                collab[rows] = 1 / np.fromiter(degrees.values(), dtype=np.float32, count=len(degrees))
+
+        total = (
+            WEIGHTS["archetype"] * archetype
+            + WEIGHTS["tier"] * tier
+            + WEIGHTS["themes"] * (themes / len(tags) if tags else themes)
+            + WEIGHTS["coalitions"] * np.minimum(shared, SHARED_COALITIONS_CAP) / SHARED_COALITIONS_CAP
+            + WEIGHTS["collab"] * collab
+        )
+        total[~self.active] = -np.inf
+        if poster_row is not None:
+            total[poster_row] = -np.inf
+
+        k = min(limit, n)
+        top = np.argpartition(-total, k - 1)[:k]
+        top = top[np.argsort(-total[top], kind="stable")]
+        return [
+            {
+                "user_id": int(self.user_ids[row]),
+                "username": self.usernames[row],
+                "archetype_id": int(self.archetype_ids[row]) or None,
+                "score": round(float(total[row]), 4),
+                "reasons": {
+                    "archetype_match": bool(archetype[row]),
+                    "tier_level": int(self.tier_levels[row]) or None,
+                    "shared_themes": int(themes[row]),
+                    "shared_coalitions": int(shared[row]),
+                    "collab_degree": degrees.get(int(row)),
+                },
+            }
+            for row in top
+            if np.isfinite(total[row])
+        ]
+
+
+# ------------------------------------------
+# Loading and refreshing the shared index
+# ------------------------------------------
+index = CreatorIndex()
+_dirty: set[int] = set()
+_lock = asyncio.Lock()
+
+members = models.coalition_members
+links = models.CollabLink.__table__
+
+
+def mark_dirty(*user_ids) -> None:
+    """Queue users whose profile, memberships or verified links changed."""
+    _dirty.update(int(user_id) for user_id in user_ids)
+
+
+async def _fetch(db: AsyncSession, user_ids: Optional[set[int]] = None):
+    users_query = select(
+        models.User.id,
+        models.User.username,
+        models.User.archetype_id,
+        models.Tier.level.label("tier_level"),
+        models.User.preferred_themes,
+    ).outerjoin(models.Tier, models.User.tier_id == models.Tier.id)
+    members_query = select(members.c.user_id, members.c.coalition_id)
+    links_query = select(links.c.user_a_username, links.c.user_b_username).where(links.c.status == "verified")
+
+    # Keys are bound as one array each (= ANY): the dirty set has no upper
+    # bound and an IN list could pass the driver's 32767-parameter limit
+    if user_ids is not None:
+        ids = bindparam("ids", list(user_ids), type_=ARRAY(Integer))
+        users_query = users_query.where(models.User.id == any_(ids))
+        members_query = members_query.where(members.c.user_id == any_(ids))
+
+    users = (await db.execute(users_query)).all()
+    memberships = (await db.execute(members_query)).all()
+    if user_ids is not None:
+        usernames = [user.username for user in users if user.username]
+        if not usernames:
+            return users, memberships, []
+        names = bindparam("names", usernames, type_=ARRAY(String))
+        links_query = links_query.where(
+            or_(links.c.user_a_username == any_(names), links.c.user_b_username == any_(names))
+        )
+    return users, memberships, (await db.execute(links_query)).all()
+
+
+async def rebuild(db: AsyncSession) -> None:
+    global index
+    covered = set(_dirty)  # marks arriving mid-build are applied by the next refresh
+    users, memberships, verified_links = await _fetch(db)
+    # Seconds of CPU at 100k users: keep the event loop serving requests meanwhile
+    index = await run_in_threadpool(CreatorIndex.build, users, memberships, verified_links)
+    _dirty.difference_update(covered)
+
+
+async def refresh(db: AsyncSession) -> None:
+    user_ids = set(_dirty)
+    _dirty.clear()
+    try:
+        users, memberships, verified_links = await _fetch(db, user_ids)
+    except Exception:
+        _dirty.update(user_ids)
+        raise
+    index.update(user_ids, users, memberships, verified_links)
+
+
+def _rebuild_due() -> bool:
+    return index.built_at is None or time.monotonic() - index.built_at > MATCHING_REBUILD_SECONDS
+
+
+async def keep_fresh() -> None:
+    """
+    Background task: builds the index, then folds in dirty users every
+    MATCHING_REFRESH_SECONDS and rebuilds every MATCHING_REBUILD_SECONDS.
+    """
+    while True:
+        if _dirty or _rebuild_due():
+            try:
+                async for db in get_db():
+                    async with _lock:
+                        if _rebuild_due():
+                            await rebuild(db)
+                        elif _dirty:
+                            await refresh(db)
+            except Exception as e:
+                # Keep serving the previous index
+                print("⚠️ Matching index refresh failed:", str(e))
+        await asyncio.sleep(MATCHING_REFRESH_SECONDS)
+
+
+async def suggest(
+    db: AsyncSession,
+    needed_archetypes: list[str],
+    coalition_tags: list[str],
+    poster_id: Optional[int],
+    limit: int,
+) -> list[dict]:
+    if index.built_at is None:
+        # Built only by keep_fresh(), never on the request path
+        raise HTTPException(
+            status_code=503,
+            detail="Creator suggestions are still being prepared",
+            headers={"Retry-After": str(int(MATCHING_REFRESH_SECONDS) or 1)},
+        )
+
+    snapshot = await reference_data.archetypes.get(db)
+    ids_by_name = {row["name"].lower(): row["id"] for row in snapshot.rows}
+    archetype_ids = {ids_by_name[name.lower()] for name in needed_archetypes or [] if name.lower() in ids_by_name}
+
+    items = index.score(archetype_ids, tags_of(coalition_tags), poster_id, limit)
+    for item in items:
+        item["archetype"] = reference_data.archetypes.name_of(item["archetype_id"])
+    return items
+
+
+def stats() -> dict:
+    return {
+        "users": int(index.active.sum()),
+        "age_seconds": round(time.monotonic() - index.built_at, 1) if index.built_at is not None else None,
+        "dirty": len(_dirty),
+    }
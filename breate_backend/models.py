@@ -1,5 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Text, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, ForeignKey, Table, Text, DateTime, Index,
+    PrimaryKeyConstraint, UniqueConstraint, CheckConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from breate_backend.database import Base
 
@@ -9,8 +13,11 @@ from breate_backend.database import Base
 coalition_members = Table(
     "coalition_members",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE")),
-    Column("coalition_id", Integer, ForeignKey("coalitions.id", ondelete="CASCADE")),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("coalition_id", Integer, ForeignKey("coalitions.id", ondelete="CASCADE"), nullable=False),
+    # Coalition first: serves member counts and member pages by coalition
+    PrimaryKeyConstraint("coalition_id", "user_id", name="coalition_members_pkey"),
+    Index("ix_coalition_members_user_id", "user_id"),
 )
 
 # ------------------------------------------------------
@@ -48,15 +55,17 @@ class User(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
-    password = Column(String, nullable=False)
+    # Deferred: only login reads the hash (undefer(User.password) there)
+    password = deferred(Column(String, nullable=False))
 
     username = Column(String, unique=True, index=True, nullable=True)
     full_name = Column(String, nullable=True)
-    bio = Column(Text, nullable=True)
-    preferred_themes = Column(Text, nullable=True)
-    portfolio_links = Column(Text, nullable=True)
-    next_build = Column(Text, nullable=True)
-    affiliations = Column(Text, nullable=True)
+    # Free-text profile fields are deferred as one group; list reads never need them
+    bio = deferred(Column(Text, nullable=True), group="profile")
+    preferred_themes = deferred(Column(Text, nullable=True), group="profile")
+    portfolio_links = deferred(Column(Text, nullable=True), group="profile")
+    next_build = deferred(Column(Text, nullable=True), group="profile")
+    affiliations = deferred(Column(Text, nullable=True), group="profile")
 
     archetype_id = Column(Integer, ForeignKey("archetypes.id"))
     tier_id = Column(Integer, ForeignKey("tiers.id"))
@@ -70,6 +79,14 @@ class User(Base):
     # Projects this user posted
     projects = relationship("Project", back_populates="poster")
 
+    # Trigram index so discover's `username ILIKE '%name%'` avoids a seq scan
+    __table_args__ = (
+        Index(
+            "ix_users_username_trgm", "username",
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+    )
+
 
 # ------------------------------------------------------
 # ✅ Coalition Model (no creator_id)
@@ -87,6 +104,18 @@ class Coalition(Base):
     # Members (many-to-many)
     members = relationship("User", secondary=coalition_members, back_populates="coalitions")
 
+    # Unique names (seeding relies on it) and trigram indexes for the
+    # substring search in GET /coalitions/
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_coalitions_name"),
+        Index("ix_coalitions_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_coalitions_focus_trgm", "focus", postgresql_using="gin", postgresql_ops={"focus": "gin_trgm_ops"}),
+        Index(
+            "ix_coalitions_location_trgm", "location",
+            postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+    )
+
 
 # ------------------------------------------------------
 # ✅ Project Model
@@ -96,18 +125,30 @@ class Project(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    objective = Column(Text, nullable=False)
+    # Large text columns load only when asked for (undefer_group("detail"))
+    objective = deferred(Column(Text, nullable=False), group="detail")
     project_type = Column(String, nullable=False)
-    needed_archetypes = Column(Text, nullable=False)  # comma-separated list
-    open_roles = Column(Text, nullable=True)
+    needed_archetypes = Column(ARRAY(String), nullable=False, server_default="{}")
+    open_roles = deferred(Column(Text, nullable=True), group="detail")
     timeline = Column(String, nullable=True)
     region = Column(String, nullable=True)
-    coalition_tags = Column(Text, nullable=True)  # comma-separated list
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    coalition_tags = Column(ARRAY(String), nullable=False, server_default="{}")
+    # NOT NULL: the feed cursor is built from it
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     poster_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     poster = relationship("User", back_populates="projects")
 
+    # Keyset feed: (created_at, id) is the sort key, optionally behind a filter
+    __table_args__ = (
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_region_created_at_id", "region", "created_at", "id"),
+        Index("ix_projects_type_created_at_id", "project_type", "created_at", "id"),
+        # GIN indexes serve `@>` containment, e.g. "needs a Systems Thinker"
+        Index("ix_projects_needed_archetypes", "needed_archetypes", postgresql_using="gin"),
+        Index("ix_projects_coalition_tags", "coalition_tags", postgresql_using="gin"),
+    )
+
 
 # ------------------------------------------------------
 # ✅ Collab Circle (Verified Collaboration Links)
@@ -123,14 +164,10 @@ class CollabLink(Base):
     verified_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-
-
-
-
-
-
-
-
-
-
-
+    # Links are stored once per pair, usernames in code-point order (a <= b).
+    # The unique constraint's index also serves "links where a = X".
+    __table_args__ = (
+        UniqueConstraint("user_a_username", "user_b_username", name="uq_collab_links_pair"),
+        CheckConstraint('user_a_username <= user_b_username COLLATE "C"', name="ck_collab_links_canonical_pair"),
+        Index("ix_collab_links_user_b_username", "user_b_username"),
+    )
@@ -0,0 +1,60 @@
+import os
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import RedirectResponse
+
+# ------------------------------------------
+# Shared helpers for multi-get routes (?ids=1,2,3)
+# ------------------------------------------
+# Multi-get routes live on the slashless collection path (/projects?ids=),
+# which used to redirect to the list route (/projects/). Without keys they
+# keep doing that.
+MULTIGET_MAX_KEYS = int(os.getenv("MULTIGET_MAX_KEYS", 100))
+
+
+def parse_keys(values: list[str], cast=str) -> list:
+    """
+    Accepts repeated (?ids=1&ids=2) and comma-separated (?ids=1,2) forms.
+    Order is kept and duplicates dropped; bad values are a 400.
+    """
+    keys = []
+    for value in values:
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                key = cast(part)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid key: {part}")
+            if key not in keys:
+                keys.append(key)
+
+    if not keys:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No keys given")
+    if len(keys) > MULTIGET_MAX_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MULTIGET_MAX_KEYS} keys per request",
+        )
+    return keys
+
+
+def keyed(rows: list[dict], key: str, requested: list) -> dict:
+    """
+    {"results": {key: row}, "missing": [keys not found]}; JSON object keys
+    are strings, so numeric ids come back as "12".
+    """
+    found = {row[key]: row for row in rows}
+    return {
+        "results": {str(k): found[k] for k in requested if k in found},
+        "missing": [k for k in requested if k not in found],
+    }
+
+
+def list_redirect(request: Request) -> RedirectResponse:
+    """
+    The 307 to the trailing-slash list route that Starlette's
+    redirect_slashes sent before the multi-get route took this path.
+    """
+    return RedirectResponse(request.url.replace(path=request.url.path + "/"), status_code=307)
@@ -0,0 +1,31 @@
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+
+# ------------------------------------------
+# Opaque keyset cursors
+# ------------------------------------------
+def encode_cursor(*values) -> str:
+    """
+    Packs the sort key of the last row on a page into an opaque,
+    URL-safe token that clients pass back as `?cursor=`.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Reverses encode_cursor(). Raises 400 for anything we did not issue.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# ------------------------------------------
+# ORM-free read path for list endpoints
+# ------------------------------------------
+# List routes select exactly the columns their response schema declares and
+# turn the Core rows straight into dicts: no identity map, no instance state,
+# no deferred Text columns, and nothing left for a second validation pass.
+
+
+def columns_for(schema: type[BaseModel], model, **computed) -> list:
+    """
+    `model` columns named like `schema`'s fields, in field order. Fields the
+    model has no column for are passed as labelled SQL expressions.
+    """
+    return [
+        computed[name].label(name) if name in computed else getattr(model, name)
+        for name in schema.model_fields
+    ]
+
+
+async def fetch_dicts(db: AsyncSession, query) -> list[dict]:
+    return [dict(row) for row in (await db.execute(query)).mappings()]
@@ -0,0 +1,251 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from breate_backend import models
+from breate_backend.database import get_db
+
+# ------------------------------------------
+# "Coalitions you might join" from co-membership
+# ------------------------------------------
+# A periodic batch turns coalition_members into a sparse user x coalition
+# matrix and computes coalition-coalition Jaccard similarity
+# (|A ∩ B| / |A ∪ B| over member sets). A user's candidates are scored by
+# three components, each scaled to 0..1:
+#
+#   co_membership  summed similarity to the user's coalitions (relative to
+#                  the user's best candidate)
+#   focus          share of the user's coalitions with the same focus
+#   location       share of the user's coalitions with the same location
+#
+# Only the top RECOMMENDATIONS_TOP_K per user are kept, so a request is a
+# dictionary lookup; until the first batch finishes, for_user() answers 503.
+# Users with nothing to go on get the largest coalitions.
+#
+# Co-membership counts are accumulated sparsely (one entry per pair of
+# coalitions that share a member). The similarity matrix used for scoring
+# is dense (coalitions^2 float32), so only the RECOMMENDATIONS_MAX_COALITIONS
+# largest coalitions take part in it: 4096 coalitions is 64 MB.
+RECOMMENDATIONS_REFRESH_SECONDS = float(os.getenv("RECOMMENDATIONS_REFRESH_SECONDS", 900))
+RECOMMENDATIONS_TOP_K = int(os.getenv("RECOMMENDATIONS_TOP_K", 50))
+RECOMMENDATIONS_MAX_COALITIONS = int(os.getenv("RECOMMENDATIONS_MAX_COALITIONS", 4096))
+
+WEIGHTS = {"co_membership": 0.6, "focus": 0.25, "location": 0.15}
+
+# Users scored per vectorized block (bounds the block's memory)
+_USERS_PER_BLOCK = 1024
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    row_of: dict[int, int]      # user id -> row of top_ids / top_scores
+    top_ids: np.ndarray         # users x K coalition ids, -1 padded
+    top_scores: np.ndarray      # users x K
+    popular: tuple[tuple[int, float], ...]
+    coalitions: dict[int, dict]
+    built_at: float
+
+
+def _one_hot(values: list[Optional[str]]) -> np.ndarray:
+    """coalitions x categories indicator matrix; blank values match nothing."""
+    keys = [value.strip().lower() if value and value.strip() else None for value in values]
+    categories = {key: i for i, key in enumerate(sorted({key for key in keys if key}))}
+    matrix = np.zeros((len(keys), len(categories)), dtype=np.float32)
+    for row, key in enumerate(keys):
+        if key:
+            matrix[row, categories[key]] = 1
+    return matrix
+
+
+def _jaccard(users: np.ndarray, cols: np.ndarray, starts: np.ndarray, n: int) -> np.ndarray:
+    """
+    Coalition x coalition Jaccard similarity. `users`/`cols` are membership
+    pairs sorted by user and `starts` the first index of each user's run.
+    Co-membership counts come from every within-user pair of memberships,
+    counted per distinct pair (memory grows with the pairs, not with n^2).
+    """
+    sizes = np.diff(np.append(starts, len(users)))
+    pair_counts = np.repeat(sizes, sizes)  # for each membership: its user's size
+    left = np.repeat(np.arange(len(users)), pair_counts)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+    right = np.repeat(np.repeat(starts, sizes), pair_counts) + offsets
+    distinct = cols[left] != cols[right]
+
+    pairs, together = np.unique(cols[left[distinct]] * n + cols[right[distinct]], return_counts=True)
+    rows, others = np.divmod(pairs, n)
+    members = np.bincount(cols, minlength=n)
+    similarity = np.zeros((n, n), dtype=np.float32)
+    similarity[rows, others] = together / (members[rows] + members[others] - together)
+    return similarity
+
+
+def compute(coalitions, memberships, top_k: int, max_coalitions: int = RECOMMENDATIONS_MAX_COALITIONS) -> Snapshot:
+    """
+    coalitions: rows of (id, name, focus, location)
+    memberships: rows of (user_id, coalition_id)
+    Only the `max_coalitions` largest coalitions are scored and recommended.
+    """
+    coalition_ids = np.array([c.id for c in coalitions], dtype=np.int64)
+    col_of = {int(cid): i for i, cid in enumerate(coalition_ids)}
+    n = len(coalition_ids)
+
+    pairs = np.array([(u, col_of[c]) for u, c in memberships if c in col_of], dtype=np.int64).reshape(-1, 2)
+    order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+    users, cols = pairs[order, 0], pairs[order, 1]
+
+    member_counts = np.bincount(cols, minlength=n)
+    info = {
+        int(c.id): {
+            "id": int(c.id),
+            "name": c.name,
+            "focus": c.focus,
+            "location": c.location,
+            "member_count": int(member_counts[col_of[c.id]]),
+        }
+        for c in coalitions
+    }
+    by_size = np.argsort(-member_counts, kind="stable")[:top_k]
+    largest = member_counts.max() if n else 0
+    popular = tuple(
+        (int(coalition_ids[col]), round(float(member_counts[col] / largest), 4) if largest else 0.0)
+        for col in by_size
+    )
+
+    if n > max_coalitions:
+        # Drop the smallest coalitions from scoring (and their memberships)
+        scored = np.sort(np.argsort(-member_counts, kind="stable")[:max_coalitions])
+        position = np.full(n, -1, dtype=np.int64)
+        position[scored] = np.arange(len(scored))
+        kept = position[cols] >= 0
+        users, cols = users[kept], position[cols[kept]]
+        coalitions = [coalitions[col] for col in scored]
+        coalition_ids, n = coalition_ids[scored], len(scored)
+    starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]]) if len(users) else np.empty(0, dtype=np.int64)
+    sizes = np.diff(np.append(starts, len(users)))
+
+    k = min(top_k, n)
+    top_ids = np.full((len(starts), k), -1, dtype=np.int64)
+    top_scores = np.zeros((len(starts), k), dtype=np.float32)
+    if n and len(starts):
+        similarity = _jaccard(users, cols, starts, n)
+        affinities = {
+            "focus": _one_hot([c.focus for c in coalitions]),
+            "location": _one_hot([c.location for c in coalitions]),
+        }
+
+        for first in range(0, len(starts), _USERS_PER_BLOCK):
+            block = slice(first, first + _USERS_PER_BLOCK)
+            block_starts, block_sizes = starts[block], sizes[block]
+            begin, end = block_starts[0], block_starts[-1] + block_sizes[-1]
+            owner = np.repeat(np.arange(len(block_starts)), block_sizes)  # block row per membership
+            # The block's slice of the user x coalition matrix, densified so
+            # the products below run as BLAS matrix multiplies
+            joined = np.zeros((len(block_starts), n), dtype=np.float32)
+            joined[owner, cols[begin:end]] = 1
+
+            co_membership = joined @ similarity
+            best = co_membership.max(axis=1, keepdims=True)
+            score = WEIGHTS["co_membership"] * np.divide(
+                co_membership, best, out=np.zeros_like(co_membership), where=best > 0
+            )
+            for name, indicator in affinities.items():
+                if indicator.shape[1]:
+                    shares = (joined @ indicator) / block_sizes[:, None].astype(np.float32)
+                    score += WEIGHTS[name] * (shares @ indicator.T)
+
+            score[joined > 0] = -np.inf
+            score[score <= 0] = -np.inf
+
+            best_cols = np.argpartition(-score, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(score, best_cols, axis=1)
+            ranked = np.argsort(-best_scores, axis=1, kind="stable")
+            best_cols = np.take_along_axis(best_cols, ranked, axis=1)
+            best_scores = np.take_along_axis(best_scores, ranked, axis=1)
+
+            found = np.isfinite(best_scores)
+            top_ids[block] = np.where(found, coalition_ids[best_cols], -1)
+            top_scores[block] = np.where(found, best_scores, 0)
+
+    return Snapshot(
+        row_of={int(user_id): row for row, user_id in enumerate(users[starts])},
+        top_ids=top_ids,
+        top_scores=top_scores,
+        popular=popular,
+        coalitions=info,
+        built_at=time.monotonic(),
+    )
+
+
+# ------------------------------------------
+# Batch refresh and lookup
+# ------------------------------------------
+snapshot: Optional[Snapshot] = None
+
+
+async def refresh(db: AsyncSession) -> None:
+    global snapshot
+    members = models.coalition_members
+    coalitions = (await db.execute(select(
+        models.Coalition.id, models.Coalition.name, models.Coalition.focus, models.Coalition.location,
+    ).order_by(models.Coalition.id))).all()
+    memberships = (await db.execute(select(members.c.user_id, members.c.coalition_id))).all()
+    # CPU-bound: keep the event loop serving requests meanwhile
+    snapshot = await run_in_threadpool(compute, coalitions, memberships, RECOMMENDATIONS_TOP_K)
+
+
+async def keep_fresh() -> None:
+    """
+    Background task: recompute every RECOMMENDATIONS_REFRESH_SECONDS.
+    """
+    while True:
+        try:
+            async for db in get_db():
+                await refresh(db)
+        except Exception as e:
+            # Keep serving the previous snapshot
+            print("⚠️ Coalition recommendations refresh failed:", str(e))
+        await asyncio.sleep(RECOMMENDATIONS_REFRESH_SECONDS)
+
+
+def for_user(user_id: int) -> list[dict]:
+    """
+    Up to RECOMMENDATIONS_TOP_K candidates, best first. Memberships changed
+    since the last batch are not reflected; callers filter those out.
+    """
+    current = snapshot
+    if current is None:
+        # Computed only by keep_fresh(), never on the request path
+        raise HTTPException(
+            status_code=503,
+            detail="Coalition recommendations are still being prepared",
+            headers={"Retry-After": "30"},
+        )
+    row = current.row_of.get(user_id)
+    ranked, reason = [], "similar"
+    if row is not None:
+        ranked = [
+            (int(cid), round(float(score), 4))
+            for cid, score in zip(current.top_ids[row], current.top_scores[row])
+            if cid >= 0
+        ]
+    if not ranked:
+        ranked, reason = current.popular, "popular"
+    return [{**current.coalitions[cid], "score": score, "reason": reason} for cid, score in ranked]
+
+
+def stats() -> dict:
+    if snapshot is None:
+        return {"users": 0, "coalitions": 0, "age_seconds": None}
+    return {
+        "users": len(snapshot.row_of),
+        "coalitions": len(snapshot.coalitions),
+        "age_seconds": round(time.monotonic() - snapshot.built_at, 1),
+    }
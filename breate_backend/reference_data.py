@@ -0,0 +1,96 @@
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from breate_backend import models, schemas
+from breate_backend.database import get_db
+from breate_backend.http_cache import conditional_response, make_etag
+from breate_backend.projections import columns_for
+
+# ------------------------------------------
+# In-process archetype / tier cache
+# ------------------------------------------
+# These tables change a few times a year but are read on almost every page,
+# so each worker keeps a snapshot (rows plus the serialized JSON and its
+# ETag) and reloads it every REFERENCE_REFRESH_SECONDS.
+REFERENCE_REFRESH_SECONDS = float(os.getenv("REFERENCE_REFRESH_SECONDS", 300))
+REFERENCE_MAX_AGE_SECONDS = int(os.getenv("REFERENCE_MAX_AGE_SECONDS", 3600))
+
+CACHE_CONTROL = f"public, max-age={REFERENCE_MAX_AGE_SECONDS}"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    rows: tuple[dict, ...]
+    by_id: dict[int, dict]
+    body: bytes
+    etag: str
+
+
+class ReferenceTable:
+    """
+    Holds the latest Snapshot of one table. Readers only ever see a complete
+    snapshot: load() builds a new one and swaps the reference.
+    """
+
+    def __init__(self, model, schema: type[BaseModel], order_by):
+        self.model = model
+        self.columns = columns_for(schema, model)
+        self.order_by = order_by
+        self.snapshot: Optional[Snapshot] = None
+
+    async def load(self, db: AsyncSession) -> Snapshot:
+        result = await db.execute(select(*self.columns).order_by(self.order_by))
+        rows = tuple(dict(row) for row in result.mappings())
+        body = json.dumps(rows, separators=(",", ":")).encode()
+        self.snapshot = Snapshot(
+            rows=rows,
+            by_id={row["id"]: row for row in rows},
+            body=body,
+            etag=make_etag(body),
+        )
+        return self.snapshot
+
+    async def get(self, db: AsyncSession) -> Snapshot:
+        # Only hits the DB when startup seeding/refresh was skipped
+        return self.snapshot or await self.load(db)
+
+    def name_of(self, row_id: Optional[int]) -> Optional[str]:
+        row = self.snapshot.by_id.get(row_id) if self.snapshot else None
+        return row["name"] if row else None
+
+    async def response(self, request: Request, db: AsyncSession, not_found: str) -> Response:
+        snapshot = await self.get(db)
+        if not snapshot.rows:
+            raise HTTPException(status_code=404, detail=not_found)
+        return conditional_response(request, snapshot.body, snapshot.etag, CACHE_CONTROL)
+
+
+archetypes = ReferenceTable(models.Archetype, schemas.ArchetypeResponse, models.Archetype.id)
+tiers = ReferenceTable(models.Tier, schemas.TierResponse, models.Tier.id)
+
+
+async def refresh_all() -> None:
+    async for db in get_db():
+        await archetypes.load(db)
+        await tiers.load(db)
+
+
+async def keep_fresh() -> None:
+    """
+    Background task: reload both tables every REFERENCE_REFRESH_SECONDS.
+    """
+    while True:
+        await asyncio.sleep(REFERENCE_REFRESH_SECONDS)
+        try:
+            await refresh_all()
+        except Exception as e:
+            # Keep serving the previous snapshot
+            print("⚠️ Reference data refresh failed:", str(e))
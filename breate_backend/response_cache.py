@@ -0,0 +1,126 @@
+import itertools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from breate_backend.cache import TTLCache
+from breate_backend.database import DB_READ_YOUR_WRITES_SECONDS, wrote_recently
+from breate_backend.http_cache import conditional_response, make_etag
+
+# ------------------------------------------
+# Serialized response cache for hot detail routes
+# ------------------------------------------
+# Entries are keyed (namespace, resource id, query string) and hold the
+# exact JSON bytes plus their ETag, so a hit skips both the query and
+# serialization. Routers must call invalidate() after committing a write
+# that changes what a cached route would return.
+#
+# With read replicas, a render may read rows older than the write that just
+# invalidated its key. Bodies rendered from a replica within
+# DB_READ_YOUR_WRITES_SECONDS of their key's last invalidation are served
+# but not stored, and clients inside their read-your-writes window bypass
+# the cache (their reads go to the primary).
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 4096))
+
+# Browsers may store the body but must revalidate; revalidation is a cache hit + 304
+CACHE_CONTROL = "no-cache"
+
+_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+# (namespace, resource id) -> (sequence, time.monotonic()) of its last
+# invalidation; invalidate_all() sets _all_mark instead. A render whose
+# marks changed while it ran must not store its (possibly stale) result.
+# Marks outlive any render by far and are then pruned, oldest first.
+_marks: dict[tuple[str, str], tuple[int, float]] = {}
+_all_mark: tuple[int, float] = (0, float("-inf"))
+_marks_lock = threading.Lock()
+_sequence = itertools.count(1)
+_MARK_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+
+
+def _render_json(payload) -> bytes:
+    # Same encoding as fastapi's JSONResponse
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+async def cached_response(
+    request: Request,
+    namespace: str,
+    resource_id,
+    render: Callable[[], Awaitable[object]],
+) -> Response:
+    """
+    Serves the cached body for this resource/query, or awaits `render()` to
+    build it. Errors raised by render() (404s etc.) are never cached.
+    """
+    key = (namespace, str(resource_id), request.url.query)
+    # A cached body may predate this client's own write
+    entry = None if wrote_recently(request) else _cache.get(key)
+    if entry is None:
+        marks = _marks_of(key[:2])
+        body = _render_json(await render())
+        entry = CachedBody(body=body, etag=make_etag(body))
+        if marks == _marks_of(key[:2]) and not _maybe_stale(request, marks):
+            _cache.set(key, entry)
+    return conditional_response(request, entry.body, entry.etag, CACHE_CONTROL)
+
+
+def _marks_of(resource: tuple[str, str]) -> tuple:
+    return _marks.get(resource), _all_mark
+
+
+def _maybe_stale(request: Request, marks: tuple) -> bool:
+    """
+    True when render() read from a replica that may not have replayed the
+    write behind this resource's last invalidation yet.
+    """
+    if getattr(request.state, "db_replica", None) is None:
+        return False
+    invalidated_at = max(mark[1] for mark in marks if mark is not None)
+    return time.monotonic() - invalidated_at < DB_READ_YOUR_WRITES_SECONDS
+
+
+def invalidate(namespace: str, *resource_ids) -> None:
+    """
+    Drops every cached variant (any query string) of the given resources.
+    """
+    ids = {str(resource_id) for resource_id in resource_ids}
+    now = time.monotonic()
+    with _marks_lock:
+        for resource_id in ids:
+            _marks.pop((namespace, resource_id), None)  # re-inserted last: oldest marks stay first
+            _marks[(namespace, resource_id)] = (next(_sequence), now)
+        expired = itertools.takewhile(lambda item: now - item[1][1] > _MARK_SECONDS, _marks.items())
+        for resource, _ in list(expired):
+            del _marks[resource]
+    _cache.invalidate_where(lambda key: key[0] == namespace and key[1] in ids)
+
+
+def invalidate_all() -> None:
+    global _all_mark
+    with _marks_lock:
+        _all_mark = (next(_sequence), time.monotonic())
+    _cache.clear()
+
+
+def stats() -> dict:
+    return _cache.stats()
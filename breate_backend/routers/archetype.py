@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from breate_backend.database import get_db
-from breate_backend import models, schemas
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from breate_backend.database import get_read_db
+from breate_backend import reference_data, schemas
 
 router = APIRouter(
     prefix="/archetypes",
@@ -12,11 +12,9 @@ router = APIRouter(
 # Get All Archetypes
 # -----------------------------
 @router.get("/", response_model=list[schemas.ArchetypeResponse])
-def get_archetypes(db: Session = Depends(get_db)):
+async def get_archetypes(request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Returns all available archetypes.
+    Served from the in-process reference cache; answers If-None-Match with 304.
     """
-    archetypes = db.query(models.Archetype).all()
-    if not archetypes:
-        raise HTTPException(status_code=404, detail="No archetypes found")
-    return archetypes
+    return await reference_data.archetypes.response(request, db, not_found="No archetypes found")
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from fastapi.security import OAuth2PasswordBearer
-from breate_backend.database import get_db
-from breate_backend import models
+from breate_backend.database import get_write_db
+from breate_backend import models, hashing, invalidation, user_cache
 
 # ---------------------------------------
 # CONFIG
@@ -17,7 +17,6 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
-pwd_hasher = PasswordHasher()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
@@ -38,20 +37,6 @@ class LoginRequest(BaseModel):
 # ---------------------------------------
 # UTILS
 # ---------------------------------------
-def get_password_hash(password: str):
-    """Hash password with Argon2"""
-    return pwd_hasher.hash(password)
-
-
-def verify_password(plain: str, hashed: str):
-    """Verify plain password against stored hash"""
-    try:
-        pwd_hasher.verify(hashed, plain)
-        return True
-    except VerifyMismatchError:
-        return False
-
-
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """Generate JWT token"""
     to_encode = data.copy()
@@ -64,34 +49,43 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 # ROUTES
 # ---------------------------------------
 @router.post("/register")
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_write_db)):
     """
     Register a new user using JSON body (email, password, username)
     """
-    existing_user = db.query(models.User).filter(models.User.email == payload.email).first()
+    existing_user = await db.scalar(select(models.User.id).where(models.User.email == payload.email))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(payload.password)
+    hashed_password = await hashing.hash_password(payload.password)
     new_user = models.User(
         email=payload.email,
         username=payload.username or payload.email.split("@")[0],
         password=hashed_password
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await invalidation.invalidate_matching(new_user.id)
     return {"message": "User registered successfully", "user": new_user.username}
 
 
 @router.post("/login")
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_write_db)):
     """
     Login with email and password (returns JWT token)
     """
-    user = db.query(models.User).filter(models.User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password):
+    user = await db.scalar(
+        select(models.User).options(undefer(models.User.password)).where(models.User.email == payload.email)
+    )
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+
+    valid, new_hash = await hashing.verify_password(payload.password, user.password)
+    if not valid:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
 
     token = create_access_token(data={"sub": user.email})
     return {"access_token": token, "token_type": "bearer"}
@@ -100,7 +94,7 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
 # ---------------------------------------
 # AUTH HELPER (used in protected routes)
 # ---------------------------------------
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_write_db)):
     """
     Extracts and verifies the current user from a JWT token.
     """
@@ -112,7 +106,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = await user_cache.resolve_user(db, email)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1,54 +1,144 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
-
-from breate_backend import models, schemas
-from breate_backend.database import get_db
+from fastapi import APIRouter, Body, Depends, Query, HTTPException, Request, status
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+
+from breate_backend import batch, invalidation, models, multiget, recommendations, schemas, response_cache
+from breate_backend.database import get_read_db, get_write_db
+from breate_backend.search import substring_match, relevance
+from breate_backend.pagination import encode_cursor, decode_cursor
+from breate_backend.projections import columns_for, fetch_dicts
+from breate_backend.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/coalitions", tags=["Coalitions"])
 
 
+# ------------------------------------------------------
+# Helpers: member counts instead of full rosters
+# ------------------------------------------------------
+def _member_count():
+    """Correlated COUNT(*) evaluated inside the coalition query itself."""
+    return (
+        select(func.count())
+        .select_from(models.coalition_members)
+        .where(models.coalition_members.c.coalition_id == models.Coalition.id)
+        .correlate(models.Coalition)
+        .scalar_subquery()
+        .label("member_count")
+    )
+
+
+def _coalition_out(coalition: models.Coalition, member_count: int) -> schemas.CoalitionsOut:
+    return schemas.CoalitionsOut(
+        id=coalition.id,
+        name=coalition.name,
+        description=coalition.description,
+        focus=coalition.focus,
+        location=coalition.location,
+        member_count=member_count,
+    )
+
+
+async def _get_coalition_out(db: AsyncSession, coalition_id: int) -> Optional[schemas.CoalitionsOut]:
+    query = select(models.Coalition, _member_count()).where(models.Coalition.id == coalition_id)
+    row = (await db.execute(query)).first()
+    return _coalition_out(*row) if row else None
+
+
 # ------------------------------------------------------
 # ✅ Get all coalitions (with optional search & region filters)
 # ------------------------------------------------------
 @router.get("/", response_model=List[schemas.CoalitionsOut])
-def get_coalitions(
+async def get_coalitions(
     search: Optional[str] = Query(None),
     region: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    query = db.query(models.Coalition)
+    query = select(*columns_for(schemas.CoalitionsOut, models.Coalition, member_count=_member_count()))
 
     if search:
-        s = f"%{search.lower()}%"
-        query = query.filter(
-            (models.Coalition.name.ilike(s))
-            | (models.Coalition.focus.ilike(s))
-            | (models.Coalition.location.ilike(s))
-        )
+        columns = [models.Coalition.name, models.Coalition.focus, models.Coalition.location]
+        query = query.where(substring_match(columns, search))
+        order_by = relevance(db.get_bind().dialect.name, columns, search)
+        if order_by is not None:
+            query = query.order_by(order_by)
 
     if region and region != "All":
-        query = query.filter(models.Coalition.location == region)
+        query = query.where(models.Coalition.location == region)
+
+    return ORJSONResponse(await fetch_dicts(db, query))
+
+
+# ------------------------------------------------------
+# ✅ Get many coalitions by ID (?ids=1,2,3)
+# ------------------------------------------------------
+@router.get("")
+async def get_coalitions_by_ids(
+    request: Request,
+    ids: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Without ?ids= this is still the redirect to the list route
+    if ids is None:
+        return multiget.list_redirect(request)
+    coalition_ids = multiget.parse_keys(ids, int)
+    query = (
+        select(*columns_for(schemas.CoalitionsOut, models.Coalition, member_count=_member_count()))
+        .where(models.Coalition.id.in_(coalition_ids))
+    )
+    return ORJSONResponse(multiget.keyed(await fetch_dicts(db, query), "id", coalition_ids))
+
 
-    return query.all()
+# ------------------------------------------------------
+# ✅ Coalitions a user might join (declared before /{coalition_id})
+# ------------------------------------------------------
+@router.get("/recommendations")
+async def get_recommendations(
+    user_id: int,
+    limit: int = Query(10, ge=1, le=recommendations.RECOMMENDATIONS_TOP_K),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Precomputed from co-membership and focus/location affinity (see
+    recommendations.py). One indexed query drops coalitions the user has
+    joined, or that were deleted, since the last batch.
+    """
+    candidates = recommendations.for_user(user_id)
+    valid = set()
+    if candidates:
+        members = models.coalition_members
+        joined = exists().where(members.c.user_id == user_id, members.c.coalition_id == models.Coalition.id)
+        valid = set((await db.scalars(
+            select(models.Coalition.id).where(
+                models.Coalition.id.in_([c["id"] for c in candidates]),
+                ~joined,
+            )
+        )).all())
+    items = [c for c in candidates if c["id"] in valid][:limit]
+    return ORJSONResponse({"user_id": user_id, "items": items})
 
 
 # ------------------------------------------------------
 # ✅ Get single coalition by ID
 # ------------------------------------------------------
 @router.get("/{coalition_id}", response_model=schemas.CoalitionsOut)
-def get_coalition(coalition_id: int, db: Session = Depends(get_db)):
-    coalition = db.query(models.Coalition).filter(models.Coalition.id == coalition_id).first()
-    if not coalition:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalition not found")
-    return coalition
+async def get_coalition(coalition_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def render():
+        coalition = await _get_coalition_out(db, coalition_id)
+        if not coalition:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalition not found")
+        return coalition
+
+    return await response_cache.cached_response(request, "coalition", coalition_id, render)
 
 
 # ------------------------------------------------------
 # ✅ Create a coalition (no creator_id at all)
 # ------------------------------------------------------
 @router.post("/", response_model=schemas.CoalitionsOut, status_code=status.HTTP_201_CREATED)
-def create_coalition(coalition: schemas.CoalitionCreate, db: Session = Depends(get_db)):
+async def create_coalition(coalition: schemas.CoalitionCreate, db: AsyncSession = Depends(get_write_db)):
     try:
         new_coalition = models.Coalition(
             name=coalition.name,
@@ -57,11 +147,13 @@ def create_coalition(coalition: schemas.CoalitionCreate, db: Session = Depends(g
             location=coalition.location,
         )
         db.add(new_coalition)
-        db.commit()
-        db.refresh(new_coalition)
-        return new_coalition
+        await db.commit()
+        return _coalition_out(new_coalition, 0)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Coalition name already exists")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating coalition: {str(e)}")
 
 
@@ -69,65 +161,179 @@ def create_coalition(coalition: schemas.CoalitionCreate, db: Session = Depends(g
 # ✅ Join a coalition
 # ------------------------------------------------------
 @router.post("/{coalition_id}/join", response_model=schemas.CoalitionsOut)
-def join_coalition(coalition_id: int, user_id: int, db: Session = Depends(get_db)):
-    coalition = db.query(models.Coalition).filter(models.Coalition.id == coalition_id).first()
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-
-    if not coalition or not user:
+async def join_coalition(coalition_id: int, user_id: int, db: AsyncSession = Depends(get_write_db)):
+    # Single INSERT: the primary key rejects duplicates, the foreign keys reject unknown ids
+    stmt = (
+        insert(models.coalition_members)
+        .values(coalition_id=coalition_id, user_id=user_id)
+        .on_conflict_do_nothing()
+        .returning(models.coalition_members.c.user_id)
+    )
+    try:
+        joined = (await db.execute(stmt)).first()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalition or user not found")
 
-    if user in coalition.members:
+    if not joined:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User already a member")
 
-    coalition.members.append(user)
-    db.commit()
-    db.refresh(coalition)
-    return coalition
+    await db.commit()
+    await invalidation.invalidate_response("coalition", coalition_id)
+    await invalidation.invalidate_matching(user_id)
+    return await _get_coalition_out(db, coalition_id)
 
 
 # ------------------------------------------------------
-# ✅ Leave a coalition
+# ✅ Join many (coalition, user) pairs at once
 # ------------------------------------------------------
-@router.post("/{coalition_id}/leave", response_model=schemas.CoalitionsOut)
-def leave_coalition(coalition_id: int, user_id: int, db: Session = Depends(get_db)):
-    coalition = db.query(models.Coalition).filter(models.Coalition.id == coalition_id).first()
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+@router.post("/memberships/batch")
+async def join_coalitions_batch(
+    items: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_write_db),
+):
+    """
+    Adds up to BATCH_MAX_ITEMS memberships with one multi-row INSERT ...
+    ON CONFLICT DO NOTHING. Per item: ok, 404 (unknown coalition/user),
+    400 (already a member) or 422 (invalid item).
+    """
+    batch.check_size(items)
+    valid, results = batch.validate_items(schemas.CoalitionMembershipItem, items)
+
+    coalition_ids = {item.coalition_id for _, item in valid}
+    user_ids = {item.user_id for _, item in valid}
+    known_coalitions = set((await db.scalars(
+        select(models.Coalition.id).where(models.Coalition.id.in_(coalition_ids))
+    )).all()) if coalition_ids else set()
+    known_users = set((await db.scalars(
+        select(models.User.id).where(models.User.id.in_(user_ids))
+    )).all()) if user_ids else set()
+
+    pending = {}  # (coalition_id, user_id) -> first index asking for it
+    for index, item in valid:
+        pair = (item.coalition_id, item.user_id)
+        if item.coalition_id not in known_coalitions or item.user_id not in known_users:
+            results[index] = batch.error(index, 404, "Coalition or user not found")
+        elif pair in pending:
+            results[index] = batch.error(index, 400, "Duplicate item in batch")
+        else:
+            pending[pair] = index
+
+    if pending:
+        stmt = (
+            insert(models.coalition_members)
+            .on_conflict_do_nothing()
+            .returning(models.coalition_members.c.coalition_id, models.coalition_members.c.user_id)
+        )
+        # executemany + RETURNING: SQLAlchemy sends it as multi-row VALUES pages
+        rows = [{"coalition_id": c, "user_id": u} for c, u in pending]
+        inserted = {tuple(row) for row in (await db.execute(stmt, rows)).all()}
+        await db.commit()
+
+        for pair, index in pending.items():
+            if pair in inserted:
+                results[index] = batch.ok(index, coalition_id=pair[0], user_id=pair[1])
+            else:
+                results[index] = batch.error(index, 400, "User already a member")
+        for coalition_id in {c for c, _ in inserted}:
+            await invalidation.invalidate_response("coalition", coalition_id)
+        await invalidation.invalidate_matching(*{u for _, u in inserted})
+
+    return ORJSONResponse(batch.summary(results, len(items)))
 
-    if not coalition or not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalition or user not found")
 
-    if user not in coalition.members:
+# ------------------------------------------------------
+# ✅ Leave a coalition
+# ------------------------------------------------------
+@router.post("/{coalition_id}/leave", response_model=schemas.CoalitionsOut)
+async def leave_coalition(coalition_id: int, user_id: int, db: AsyncSession = Depends(get_write_db)):
+    stmt = (
+        delete(models.coalition_members)
+        .where(
+            models.coalition_members.c.coalition_id == coalition_id,
+            models.coalition_members.c.user_id == user_id,
+        )
+        .returning(models.coalition_members.c.user_id)
+    )
+    left = (await db.execute(stmt)).first()
+
+    if not left:
+        # Nothing deleted: only now work out which error to report
+        coalition = await db.scalar(select(models.Coalition.id).where(models.Coalition.id == coalition_id))
+        user = await db.scalar(select(models.User.id).where(models.User.id == user_id))
+        if not coalition or not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalition or user not found")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User not a member of this coalition")
 
-    coalition.members.remove(user)
-    db.commit()
-    db.refresh(coalition)
-    return coalition
+    await db.commit()
+    await invalidation.invalidate_response("coalition", coalition_id)
+    await invalidation.invalidate_matching(user_id)
+    return await _get_coalition_out(db, coalition_id)
 
 
 # ------------------------------------------------------
-# ✅ List coalition members
+# ✅ List coalition members (keyset-paginated on user id)
 # ------------------------------------------------------
-@router.get("/{coalition_id}/members", response_model=List[schemas.UserResponse])
-def list_coalition_members(coalition_id: int, db: Session = Depends(get_db)):
-    coalition = db.query(models.Coalition).filter(models.Coalition.id == coalition_id).first()
+@router.get("/{coalition_id}/members", response_model=schemas.CoalitionMemberPage)
+async def list_coalition_members(
+    coalition_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    coalition = await db.scalar(select(models.Coalition.id).where(models.Coalition.id == coalition_id))
     if not coalition:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalition not found")
-    return coalition.members
+
+    query = (
+        select(*columns_for(schemas.UserResponse, models.User))
+        .join(models.coalition_members, models.coalition_members.c.user_id == models.User.id)
+        .where(models.coalition_members.c.coalition_id == coalition_id)
+    )
+
+    if cursor:
+        (after_id,) = decode_cursor(cursor, 1)
+        try:
+            after_id = int(after_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.where(models.User.id > after_id)
+
+    members = await fetch_dicts(db, query.order_by(models.User.id).limit(limit + 1))
+
+    next_cursor = None
+    if len(members) > limit:
+        members = members[:limit]
+        next_cursor = encode_cursor(members[-1]["id"])
+
+    return ORJSONResponse({"items": members, "next_cursor": next_cursor})
 
 
 # ------------------------------------------------------
 # ✅ Delete coalition (no creator check)
 # ------------------------------------------------------
 @router.delete("/{coalition_id}", status_code=status.HTTP_200_OK)
-def delete_coalition(coalition_id: int, db: Session = Depends(get_db)):
-    coalition = db.query(models.Coalition).filter(models.Coalition.id == coalition_id).first()
-    if not coalition:
+async def delete_coalition(coalition_id: int, db: AsyncSession = Depends(get_write_db)):
+    # Memberships are deleted explicitly (rather than left to ON DELETE
+    # CASCADE) only to learn whose matching features change
+    member_ids = (await db.scalars(
+        delete(models.coalition_members)
+        .where(models.coalition_members.c.coalition_id == coalition_id)
+        .returning(models.coalition_members.c.user_id)
+    )).all()
+    stmt = (
+        delete(models.Coalition)
+        .where(models.Coalition.id == coalition_id)
+        .returning(models.Coalition.name)
+    )
+    name = (await db.execute(stmt)).scalar()
+    if name is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalition not found")
 
-    db.delete(coalition)
-    db.commit()
-    return {"detail": f"Coalition '{coalition.name}' deleted successfully"}
+    await db.commit()
+    await invalidation.invalidate_response("coalition", coalition_id)
+    await invalidation.invalidate_matching(*member_ids)
+    return {"detail": f"Coalition '{name}' deleted successfully"}
 
 
 
@@ -1,19 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, HTTPException, Depends, Query, Request
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+from typing import Any, Dict, List
 
 # ✅ Correct absolute imports
-from breate_backend import models, schemas
-from breate_backend.database import get_db
+from breate_backend import batch, invalidation, models, schemas, collab_graph, response_cache
+from breate_backend.database import get_read_db, get_write_db
+from breate_backend.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/collabcircle", tags=["Collab Circle"])
 
 
+def canonical_pair(username_1: str, username_2: str) -> tuple[str, str]:
+    """
+    Links are stored once per pair with user_a <= user_b (code-point order),
+    so every pair lookup is a single equality match on the unique index.
+    """
+    return (username_1, username_2) if username_1 <= username_2 else (username_2, username_1)
+
+
 # -----------------------------
 # 1️⃣ Create a collaboration link (pending)
 # -----------------------------
 @router.post("/create")
-def create_collab_link(link: schemas.CollabCreate, db: Session = Depends(get_db)):
+async def create_collab_link(link: schemas.CollabCreate, db: AsyncSession = Depends(get_write_db)):
     """
     Creates a pending collaboration link between two users (by username).
     Example body:
@@ -24,85 +36,209 @@ def create_collab_link(link: schemas.CollabCreate, db: Session = Depends(get_db)
     }
     """
 
-    # Verify both users exist
-    user_a = db.query(models.User).filter(models.User.username == link.user_a_username).first()
-    user_b = db.query(models.User).filter(models.User.username == link.user_b_username).first()
+    user_a, user_b = canonical_pair(link.user_a_username, link.user_b_username)
 
-    if not user_a or not user_b:
+    # Verify both users exist (one query)
+    usernames = {user_a, user_b}
+    found = await db.scalar(select(func.count(models.User.id)).where(models.User.username.in_(usernames)))
+    if found < len(usernames):
         raise HTTPException(status_code=404, detail="One or both users not found")
 
-    # Prevent duplicate links
-    existing = db.query(models.CollabLink).filter(
-        ((models.CollabLink.user_a_username == link.user_a_username) &
-         (models.CollabLink.user_b_username == link.user_b_username)) |
-        ((models.CollabLink.user_a_username == link.user_b_username) &
-         (models.CollabLink.user_b_username == link.user_a_username))
-    ).first()
+    # Upsert: the unique pair constraint rejects duplicates atomically
+    stmt = (
+        insert(models.CollabLink)
+        .values(
+            user_a_username=user_a,
+            user_b_username=user_b,
+            project_name=link.project_name,
+            status="pending",
+        )
+        .on_conflict_do_nothing(constraint="uq_collab_links_pair")
+        .returning(models.CollabLink.id)
+    )
+    link_id = (await db.execute(stmt)).scalar()
 
-    if existing:
+    if link_id is None:
         raise HTTPException(status_code=400, detail="Collaboration already exists")
 
-    new_link = models.CollabLink(
-        user_a_username=link.user_a_username,
-        user_b_username=link.user_b_username,
-        project_name=link.project_name,
-        status="pending"
-    )
+    await db.commit()
+    await invalidation.invalidate_response("collabcircle", user_a, user_b)
+    await invalidation.publish_event("collab.created", {
+        "link_id": str(link_id),
+        "user_a_username": user_a,
+        "user_b_username": user_b,
+        "project_name": link.project_name,
+        "status": "pending",
+    })
+    return {"message": "Collaboration link created successfully.", "link_id": str(link_id)}
+
 
-    db.add(new_link)
-    db.commit()
-    db.refresh(new_link)
-    return {"message": "Collaboration link created successfully.", "link_id": str(new_link.id)}
+# -----------------------------
+# 1️⃣b Create many collaboration links at once
+# -----------------------------
+@router.post("/create/batch")
+async def create_collab_links_batch(
+    items: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_write_db),
+):
+    """
+    Creates up to BATCH_MAX_ITEMS pending links (same body as /create, as a
+    list) with one multi-row INSERT ... ON CONFLICT DO NOTHING.
+    """
+    batch.check_size(items)
+    valid, results = batch.validate_items(schemas.CollabCreate, items)
+
+    usernames = {name for _, link in valid for name in (link.user_a_username, link.user_b_username)}
+    known = set((await db.scalars(
+        select(models.User.username).where(models.User.username.in_(usernames))
+    )).all()) if usernames else set()
+
+    pending = {}  # canonical pair -> (index, project_name)
+    for index, link in valid:
+        pair = canonical_pair(link.user_a_username, link.user_b_username)
+        if pair[0] not in known or pair[1] not in known:
+            results[index] = batch.error(index, 404, "One or both users not found")
+        elif pair in pending:
+            results[index] = batch.error(index, 400, "Duplicate item in batch")
+        else:
+            pending[pair] = (index, link.project_name)
+
+    if pending:
+        stmt = (
+            insert(models.CollabLink)
+            .on_conflict_do_nothing(constraint="uq_collab_links_pair")
+            .returning(models.CollabLink.id, models.CollabLink.user_a_username, models.CollabLink.user_b_username)
+        )
+        rows = [
+            {"user_a_username": a, "user_b_username": b, "project_name": project_name, "status": "pending"}
+            for (a, b), (_, project_name) in pending.items()
+        ]
+        created = {(a, b): link_id for link_id, a, b in (await db.execute(stmt, rows)).all()}
+        await db.commit()
+
+        links = []
+        for pair, (index, project_name) in pending.items():
+            if pair in created:
+                results[index] = batch.ok(index, link_id=str(created[pair]))
+                links.append({
+                    "link_id": str(created[pair]),
+                    "user_a_username": pair[0],
+                    "user_b_username": pair[1],
+                    "project_name": project_name,
+                    "status": "pending",
+                })
+            else:
+                results[index] = batch.error(index, 400, "Collaboration already exists")
+        # One event for the whole batch, so it cannot overflow subscriber queues
+        if links:
+            await invalidation.publish_event("collab.batch_created", {"items": links})
+        await invalidation.invalidate_response("collabcircle", *{name for pair in created for name in pair})
+
+    return ORJSONResponse(batch.summary(results, len(items)))
 
 
 # -----------------------------
 # 2️⃣ Verify collaboration (mutual confirmation)
 # -----------------------------
 @router.post("/verify")
-def verify_link(user_a_username: str, user_b_username: str, db: Session = Depends(get_db)):
+async def verify_link(user_a_username: str, user_b_username: str, db: AsyncSession = Depends(get_write_db)):
     """
     Marks a collaboration as verified using both usernames.
     """
-    link = db.query(models.CollabLink).filter(
-        ((models.CollabLink.user_a_username == user_a_username) &
-         (models.CollabLink.user_b_username == user_b_username)) |
-        ((models.CollabLink.user_a_username == user_b_username) &
-         (models.CollabLink.user_b_username == user_a_username))
-    ).first()
-
-    if not link:
-        raise HTTPException(status_code=404, detail="Collaboration not found")
+    user_a, user_b = canonical_pair(user_a_username, user_b_username)
+    stmt = (
+        update(models.CollabLink)
+        .where(
+            models.CollabLink.user_a_username == user_a,
+            models.CollabLink.user_b_username == user_b,
+        )
+        .values(status="verified", verified_at=datetime.utcnow())
+        .returning(models.CollabLink.id, models.CollabLink.project_name, models.CollabLink.verified_at)
+    )
+    row = (await db.execute(stmt)).first()
+    link_id = row.id if row else None
 
-    link.status = "verified"
-    link.verified_at = datetime.utcnow()
-    db.commit()
+    if link_id is None:
+        raise HTTPException(status_code=404, detail="Collaboration not found")
 
+    await db.commit()
+    await invalidation.invalidate_response("collabcircle", user_a, user_b)
+    user_ids = (await db.scalars(select(models.User.id).where(models.User.username.in_([user_a, user_b])))).all()
+    await invalidation.invalidate_matching(*user_ids)
+    await invalidation.publish_event("collab.verified", {
+        "link_id": str(link_id),
+        "user_a_username": user_a,
+        "user_b_username": user_b,
+        "project_name": row.project_name,
+        "status": "verified",
+        "verified_at": row.verified_at,
+    })
     return {"message": "Collaboration verified successfully."}
 
 
 # -----------------------------
-# 3️⃣ Fetch a user’s Collab Circle
+# 3️⃣ How are two users connected? (shortest verified path)
+# -----------------------------
+@router.get("/path/{source}/{target}")
+async def get_connection_path(
+    source: str,
+    target: str,
+    max_depth: int = Query(6, ge=1, le=8),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Returns the shortest chain of verified collaborations from `source` to `target`.
+    """
+    path = await collab_graph.shortest_path(db, source, target, max_depth)
+    if path is None:
+        raise HTTPException(status_code=404, detail="No verified connection found")
+
+    return {"path": path, "degrees": len(path) - 1}
+
+
+# -----------------------------
+# 4️⃣ Extended circle: collaborators of collaborators (k hops)
+# -----------------------------
+@router.get("/{username}/network")
+async def get_collab_network(
+    username: str,
+    depth: int = Query(2, ge=1, le=3),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Returns users within `depth` verified hops of `username`, nearest first.
+    """
+    network = await collab_graph.neighborhood(db, username, depth, limit)
+    return {"username": username, "network": network}
+
+
+# -----------------------------
+# 5️⃣ Fetch a user’s Collab Circle
 # -----------------------------
 @router.get("/{username}")
-def get_collab_circle(username: str, db: Session = Depends(get_db)):
+async def get_collab_circle(username: str, request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Returns all collaborations (pending + verified) for a specific user by username.
     """
-    links = db.query(models.CollabLink).filter(
-        (models.CollabLink.user_a_username == username) |
-        (models.CollabLink.user_b_username == username)
-    ).all()
-
-    collab_circle = []
-    for link in links:
-        collaborator_username = (
-            link.user_b_username if link.user_a_username == username else link.user_a_username
-        )
-        collab_circle.append({
-            "collaborator_username": collaborator_username,
-            "project_name": link.project_name,
-            "status": link.status,
-            "verified_at": getattr(link, "verified_at", None)
-        })
-
-    return {"collab_circle": collab_circle}
+    async def render():
+        links = (await db.scalars(select(models.CollabLink).where(
+            (models.CollabLink.user_a_username == username) |
+            (models.CollabLink.user_b_username == username)
+        ))).all()
+
+        collab_circle = []
+        for link in links:
+            collaborator_username = (
+                link.user_b_username if link.user_a_username == username else link.user_a_username
+            )
+            collab_circle.append({
+                "collaborator_username": collaborator_username,
+                "project_name": link.project_name,
+                "status": link.status,
+                "verified_at": getattr(link, "verified_at", None)
+            })
+
+        return {"collab_circle": collab_circle}
+
+    return await response_cache.cached_response(request, "collabcircle", username, render)
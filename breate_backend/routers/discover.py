@@ -1,39 +1,53 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from breate_backend.database import get_db
-from breate_backend import models
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from breate_backend.database import get_read_db
+from breate_backend import models, reference_data
+from breate_backend.search import substring_match, relevance
+from breate_backend.serialization import ORJSONResponse
 
 # ✅ Keep prefix consistent with main.py
 router = APIRouter(prefix="/api/v1/discover", tags=["Discover"])
 
 @router.get("/")
-def discover_creators(
+async def discover_creators(
     name: str | None = Query(None),
     archetype_id: int | None = Query(None),
     tier_id: int | None = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Returns a filtered list of users based on name, archetype, and tier.
     """
-    query = db.query(models.User)
+    # Users only: archetype/tier names come from the in-process reference cache
+    query = select(
+        models.User.id,
+        models.User.username,
+        models.User.bio,
+        models.User.archetype_id,
+        models.User.tier_id,
+    )
 
     if name:
-        query = query.filter(models.User.username.ilike(f"%{name}%"))
+        query = query.where(substring_match([models.User.username], name))
+        order_by = relevance(db.get_bind().dialect.name, [models.User.username], name)
+        if order_by is not None:
+            query = query.order_by(order_by)
     if archetype_id:
-        query = query.filter(models.User.archetype_id == archetype_id)
+        query = query.where(models.User.archetype_id == archetype_id)
     if tier_id:
-        query = query.filter(models.User.tier_id == tier_id)
+        query = query.where(models.User.tier_id == tier_id)
 
-    users = query.all()
-
-    return [
+    rows = (await db.execute(query)).all()
+    await reference_data.archetypes.get(db)
+    await reference_data.tiers.get(db)
+    return ORJSONResponse([
         {
-            "id": u.id,
-            "username": u.username,
-            "bio": u.bio,
-            "archetype": u.archetype.name if u.archetype else None,
-            "tier": u.tier.name if u.tier else None,
+            "id": row.id,
+            "username": row.username,
+            "bio": row.bio,
+            "archetype": reference_data.archetypes.name_of(row.archetype_id),
+            "tier": reference_data.tiers.name_of(row.tier_id),
         }
-        for u in users
-    ]
+        for row in rows
+    ])
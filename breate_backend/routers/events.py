@@ -0,0 +1,68 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from breate_backend import events
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+def _filter(types: Optional[str], username: Optional[str]):
+    wanted = {t.strip() for t in types.split(",") if t.strip()} if types else None
+
+    def matches(event: events.Event) -> bool:
+        if wanted is not None and event.type not in wanted:
+            return False
+        if username and event.type.startswith("collab."):
+            links = event.data.get("items", [event.data])
+            return any(username in (link.get("user_a_username"), link.get("user_b_username")) for link in links)
+        return True
+
+    return matches
+
+
+# -----------------------------
+# Live updates (Server-Sent Events)
+# -----------------------------
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    types: Optional[str] = Query(None, description="Comma-separated, e.g. project.created,collab.verified"),
+    username: Optional[str] = Query(None, description="Only collab events involving this user"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Pushes project.created, collab.created and collab.verified events. Batch
+    endpoints publish one project.batch_created / collab.batch_created event
+    per request, whose data is {"items": [...]} with the single-item shape.
+    Browsers' EventSource reconnects on its own and sends Last-Event-ID,
+    so missed events are replayed from the ring buffer of whichever worker
+    it reaches; a `reset` event means the gap could not be replayed and
+    lists should be refetched.
+    """
+    subscriber = events.broker.subscribe(_filter(types, username), last_event_id)
+
+    async def stream():
+        try:
+            yield f"retry: {events.EVENTS_RETRY_MS}\n\n".encode()
+            for frame in subscriber.backlog:
+                yield frame
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), events.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"  # comment line: keeps proxies from timing out
+                    continue
+                if event is None:
+                    break  # fell too far behind; the client reconnects and resumes
+                yield event.frame
+        finally:
+            events.broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
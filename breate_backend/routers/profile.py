@@ -1,26 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from breate_backend.database import get_db
-from breate_backend import models
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from breate_backend.database import get_read_db, get_write_db
+from breate_backend import invalidation, models, multiget, response_cache, user_cache
+from breate_backend.projections import fetch_dicts
+from breate_backend.serialization import ORJSONResponse
 from breate_backend.routers.auth import get_current_user
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
+# Public profile fields (never the password hash)
+PROFILE_COLUMNS = (
+    models.User.id,
+    models.User.email,
+    models.User.username,
+    models.User.full_name,
+    models.User.bio,
+    models.User.preferred_themes,
+    models.User.portfolio_links,
+    models.User.next_build,
+    models.User.affiliations,
+    models.User.archetype_id,
+    models.User.tier_id,
+)
+
+@router.get("")
+async def get_profiles(usernames: list[str] | None = Query(None), db: AsyncSession = Depends(get_read_db)):
+    """
+    Resolves up to MULTIGET_MAX_KEYS usernames with one IN query; unknown
+    usernames are listed under "missing".
+    """
+    if usernames is None:
+        # There is no profile list: the bare path stays a 404
+        raise HTTPException(status_code=404, detail="Not Found")
+    keys = multiget.parse_keys(usernames)
+    query = select(*PROFILE_COLUMNS).where(models.User.username.in_(keys))
+    return ORJSONResponse(multiget.keyed(await fetch_dicts(db, query), "username", keys))
+
 @router.get("/{username}")
-def get_profile(username: str, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user.__dict__
+async def get_profile(username: str, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def render():
+        row = (await db.execute(select(*PROFILE_COLUMNS).where(models.User.username == username))).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+        return dict(row._mapping)
+
+    return await response_cache.cached_response(request, "profile", username, render)
 
 @router.put("/{username}")
-def update_profile(
+async def update_profile(
     username: str,
     data: dict,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_write_db),
+    current_user: user_cache.CachedUser = Depends(get_current_user),
 ):
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = await db.scalar(select(models.User).where(models.User.username == username))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.id != current_user.id:
@@ -39,8 +73,10 @@ def update_profile(
         if field in data:
             setattr(user, field, data[field])
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await invalidation.invalidate_user(current_user.email)
+    await invalidation.invalidate_response("profile", username, user.username)
+    await invalidation.invalidate_matching(user.id)
     return {"message": "Profile updated successfully"}
 
 
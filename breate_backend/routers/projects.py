@@ -1,12 +1,17 @@
 print("✅ Projects router loaded successfully!")
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from pydantic import BaseModel
-from breate_backend.database import get_db
-from breate_backend import models
+from pydantic import BaseModel, ConfigDict
+from breate_backend.database import get_read_db, get_write_db
+from breate_backend import batch, invalidation, matching, models, multiget, response_cache
+from breate_backend.pagination import encode_cursor, decode_cursor
+from breate_backend.projections import columns_for, fetch_dicts
+from breate_backend.serialization import ORJSONResponse, to_plain
 
 router = APIRouter(
     prefix="/projects",
@@ -36,87 +41,210 @@ class ProjectResponse(ProjectBase):
     id: int
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-
-
-# ---------------------------------------------------------
-# ✅ GET all projects
-# ---------------------------------------------------------
-@router.get("/", response_model=List[ProjectResponse])
-def get_projects(db: Session = Depends(get_db)):
-    projects = db.query(models.Project).order_by(models.Project.created_at.desc()).all()
-    return [
-        ProjectResponse(
-            id=p.id,
-            title=p.title,
-            objective=p.objective,
-            project_type=p.project_type,
-            needed_archetypes=p.needed_archetypes.split(",") if p.needed_archetypes else [],
-            open_roles=p.open_roles,
-            timeline=p.timeline,
-            region=p.region,
-            coalition_tags=p.coalition_tags.split(",") if p.coalition_tags else [],
-            poster_id=p.poster_id,
-            created_at=p.created_at
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectPage(BaseModel):
+    items: List[ProjectResponse]
+    next_cursor: Optional[str] = None
+
+
+# ---------------------------------------------------------
+# ✅ GET project feed (keyset-paginated on created_at, id)
+# ---------------------------------------------------------
+@router.get("/", response_model=ProjectPage)
+async def get_projects(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    region: Optional[str] = Query(None),
+    project_type: Optional[str] = Query(None),
+    archetype: Optional[str] = Query(None),
+    tag: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Returns one page of the newest projects. Pass the returned `next_cursor`
+    back as `?cursor=` to fetch the following page; it is null on the last one.
+    """
+    query = select(*columns_for(ProjectResponse, models.Project))
+
+    if region and region != "All":
+        query = query.where(models.Project.region == region)
+    if project_type:
+        query = query.where(models.Project.project_type == project_type)
+    if archetype:
+        query = query.where(models.Project.needed_archetypes.contains([archetype]))
+    if tag:
+        query = query.where(models.Project.coalition_tags.contains([tag]))
+
+    if cursor:
+        created_at, project_id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            tuple_(models.Project.created_at, models.Project.id) < (created_at, project_id)
         )
-        for p in projects
-    ]
+
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(models.Project.created_at.desc(), models.Project.id.desc()).limit(limit + 1)
+    projects = await fetch_dicts(db, query)
+
+    next_cursor = None
+    if len(projects) > limit:
+        projects = projects[:limit]
+        last = projects[-1]
+        next_cursor = encode_cursor(last["created_at"].isoformat(), last["id"])
+
+    return ORJSONResponse({"items": projects, "next_cursor": next_cursor})
 
 
 # ---------------------------------------------------------
 # ✅ POST a new project
 # ---------------------------------------------------------
 @router.post("/", response_model=ProjectResponse)
-def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(project: ProjectCreate, db: AsyncSession = Depends(get_write_db)):
     try:
-        project_data = project.dict()
-        project_data["needed_archetypes"] = ",".join(project_data.get("needed_archetypes", []))
-        project_data["coalition_tags"] = ",".join(project_data.get("coalition_tags", []))
+        project_data = project.model_dump()
+        project_data["coalition_tags"] = project_data.get("coalition_tags") or []
 
         new_project = models.Project(**project_data)
         db.add(new_project)
-        db.commit()
-        db.refresh(new_project)
-        return new_project
+        await db.commit()
+        # Only the server-generated columns: the deferred text columns are already set
+        await db.refresh(new_project, ["id", "created_at"])
+        created = to_plain(ProjectResponse, new_project)
+        await invalidation.publish_event("project.created", created)
+        return created
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating project: {str(e)}")
 
 
+# ---------------------------------------------------------
+# ✅ POST many projects (one statement, one commit)
+# ---------------------------------------------------------
+@router.post("/batch")
+async def create_projects_batch(
+    items: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_write_db),
+):
+    """
+    Creates up to BATCH_MAX_ITEMS projects. Invalid items (schema errors,
+    unknown poster_id) are reported per index; the rest are inserted with a
+    single multi-row INSERT in one transaction.
+    """
+    batch.check_size(items)
+    valid, results = batch.validate_items(ProjectCreate, items)
+
+    poster_ids = {project.poster_id for _, project in valid if project.poster_id is not None}
+    known = set()
+    if poster_ids:
+        known = set((await db.scalars(select(models.User.id).where(models.User.id.in_(poster_ids)))).all())
+
+    rows, indexes = [], []
+    for index, project in valid:
+        if project.poster_id is not None and project.poster_id not in known:
+            results[index] = batch.error(index, 404, "Poster not found")
+            continue
+        row = project.model_dump()
+        row["coalition_tags"] = row.get("coalition_tags") or []
+        rows.append(row)
+        indexes.append(index)
+
+    if rows:
+        stmt = insert(models.Project).returning(
+            models.Project.id, models.Project.created_at, sort_by_parameter_order=True
+        )
+        created = (await db.execute(stmt, rows)).all()
+        await db.commit()
+        projects = []
+        for index, row, (project_id, created_at) in zip(indexes, rows, created):
+            results[index] = batch.ok(index, id=project_id, created_at=created_at)
+            projects.append({**row, "id": project_id, "created_at": created_at})
+        # One event for the whole batch: a full batch is more items than a
+        # subscriber queue holds, and would disconnect every stream
+        await invalidation.publish_event("project.batch_created", {"items": projects})
+
+    return ORJSONResponse(batch.summary(results, len(items)))
+
+
+# ---------------------------------------------------------
+# ✅ GET many projects by ID (?ids=1,2,3)
+# ---------------------------------------------------------
+@router.get("")
+async def get_projects_by_ids(
+    request: Request,
+    ids: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Resolves up to MULTIGET_MAX_KEYS project ids with one IN query.
+    Unknown ids are listed under "missing" instead of failing the call.
+    Without ?ids= this redirects to the list route (GET /projects/).
+    """
+    if ids is None:
+        return multiget.list_redirect(request)
+    project_ids = multiget.parse_keys(ids, int)
+    query = select(*columns_for(ProjectResponse, models.Project)).where(models.Project.id.in_(project_ids))
+    return ORJSONResponse(multiget.keyed(await fetch_dicts(db, query), "id", project_ids))
+
+
 # ---------------------------------------------------------
 # ✅ GET single project by ID
 # ---------------------------------------------------------
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+async def get_project(project_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def render():
+        project = await db.get(models.Project, project_id, options=[undefer_group("detail")])
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return ProjectResponse.model_validate(project)
+
+    return await response_cache.cached_response(request, "project", project_id, render)
+
+
+# ---------------------------------------------------------
+# ✅ GET ranked creator suggestions for a project
+# ---------------------------------------------------------
+@router.get("/{project_id}/suggested-creators")
+async def get_suggested_creators(
+    project_id: int,
+    limit: int = Query(20, ge=1, le=matching.MATCHING_MAX_RESULTS),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Creators ranked for this project by archetype fit, tier, theme overlap
+    with its coalition_tags, coalitions shared with the poster and
+    Collab Circle proximity. Scored in memory (see matching.py).
+    """
+    query = select(
+        models.Project.needed_archetypes,
+        models.Project.coalition_tags,
+        models.Project.poster_id,
+    ).where(models.Project.id == project_id)
+    project = (await db.execute(query)).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return ProjectResponse(
-        id=project.id,
-        title=project.title,
-        objective=project.objective,
-        project_type=project.project_type,
-        needed_archetypes=project.needed_archetypes.split(",") if project.needed_archetypes else [],
-        open_roles=project.open_roles,
-        timeline=project.timeline,
-        region=project.region,
-        coalition_tags=project.coalition_tags.split(",") if project.coalition_tags else [],
-        poster_id=project.poster_id,
-        created_at=project.created_at
+    items = await matching.suggest(
+        db, project.needed_archetypes, project.coalition_tags, project.poster_id, limit
     )
+    return ORJSONResponse({"project_id": project_id, "items": items})
 
 
 # ---------------------------------------------------------
 # ✅ DELETE a project
 # ---------------------------------------------------------
 @router.delete("/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+async def delete_project(project_id: int, db: AsyncSession = Depends(get_write_db)):
+    project = await db.get(models.Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
+    await invalidation.invalidate_response("project", project_id)
     return {"message": f"✅ Project '{project.title}' deleted successfully"}
 
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from breate_backend.database import get_db
-from breate_backend import models, schemas
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from breate_backend.database import get_read_db
+from breate_backend import reference_data, schemas
 
 router = APIRouter(
     prefix="/tiers",
@@ -12,11 +12,9 @@ router = APIRouter(
 # Get All Tiers
 # -----------------------------
 @router.get("/", response_model=list[schemas.TierResponse])
-def get_tiers(db: Session = Depends(get_db)):
+async def get_tiers(request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Returns all available tiers.
+    Served from the in-process reference cache; answers If-None-Match with 304.
     """
-    tiers = db.query(models.Tier).all()
-    if not tiers:
-        raise HTTPException(status_code=404, detail="No tiers found")
-    return tiers
+    return await reference_data.tiers.response(request, db, not_found="No tiers found")
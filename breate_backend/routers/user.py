@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Response, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from passlib.context import CryptContext
-from breate_backend.database import get_db
-from breate_backend import models, schemas
+from breate_backend.database import get_read_db, get_write_db
+from breate_backend import models, schemas, hashing, invalidation, user_cache
 from breate_backend.auth import (
     create_access_token,
     create_refresh_token,
@@ -16,7 +17,6 @@ router = APIRouter(
     tags=["Users"]
 )
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
 
@@ -24,16 +24,16 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 # Signup Endpoint
 # -----------------------------
 @router.post("/signup", response_model=schemas.UserResponse)
-def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def signup(user: schemas.UserCreate, db: AsyncSession = Depends(get_write_db)):
     """
     Register a new user.
     Requires: email, password, archetype_id, tier_id.
     """
-    existing_user = db.query(models.User).filter(models.User.email == user.email).first()
+    existing_user = await db.scalar(select(models.User.id).where(models.User.email == user.email))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = pwd_context.hash(user.password)
+    hashed_password = await hashing.hash_password(user.password)
     new_user = models.User(
         email=user.email,
         password=hashed_password,
@@ -42,8 +42,8 @@ def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await invalidation.invalidate_matching(new_user.id)
     return new_user
 
 
@@ -51,21 +51,27 @@ def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
 # Login Endpoint (Form + Cookies)
 # -----------------------------
 @router.post("/login", response_model=schemas.Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     response: Response = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Authenticates a user and returns access + refresh tokens.
     """
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    user = await db.scalar(
+        select(models.User).options(undefer(models.User.password)).where(models.User.email == form_data.username)
+    )
 
-    if not user or not pwd_context.verify(form_data.password, user.password):
+    valid, new_hash = await hashing.verify_password(form_data.password, user.password) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
 
     access_token = create_access_token(data={"sub": user.email, "type": "access"})
     refresh_token = create_refresh_token(data={"sub": user.email, "type": "refresh"})
@@ -90,7 +96,7 @@ def login(
 # Get Current User (/users/me)
 # -----------------------------
 @router.get("/me", response_model=schemas.UserResponse)
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_read_db)):
     """
     Returns the current user's information if the access token is valid.
     """
@@ -105,7 +111,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = await user_cache.resolve_user(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -116,7 +122,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
 # Refresh Access Token
 # -----------------------------
 @router.post("/refresh", response_model=schemas.Token)
-def refresh_token(request: Request):
+async def refresh_token(request: Request):
     """
     Uses refresh token from cookies to issue a new access token.
     """
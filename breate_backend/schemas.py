@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional, List
 
 # ---------------------------------------
@@ -14,11 +14,11 @@ class UserCreate(BaseModel):
 class UserResponse(BaseModel):
     id: int
     email: EmailStr
-    archetype_id: int
-    tier_id: int
+    # Nullable columns: users may not have picked either yet
+    archetype_id: Optional[int] = None
+    tier_id: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserLogin(BaseModel):
@@ -47,8 +47,7 @@ class ArchetypeResponse(BaseModel):
     name: str
     description: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TierResponse(BaseModel):
@@ -57,8 +56,7 @@ class TierResponse(BaseModel):
     level: int
     description: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ---------------------------------------
@@ -79,16 +77,24 @@ class CoalitionMember(BaseModel):
     id: int
     email: EmailStr
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CoalitionsOut(CoalitionBase):
     id: int
-    members: List[CoalitionMember] = []
+    member_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CoalitionMembershipItem(BaseModel):
+    coalition_id: int
+    user_id: int
+
 
-    class Config:
-        orm_mode = True
+class CoalitionMemberPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
 
 
 # ---------------------------------------
@@ -106,8 +112,7 @@ class CollabResponse(BaseModel):
     status: str
     verified_at: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 
@@ -0,0 +1,33 @@
+from sqlalchemy import func, or_
+
+
+# ------------------------------------------
+# Substring search helpers
+# ------------------------------------------
+# On Postgres the searched columns carry pg_trgm GIN indexes (see models.py),
+# which serve `ILIKE '%term%'` directly as long as the column itself is not
+# wrapped in a function. Other backends get the same predicate without the
+# index, and no relevance ordering.
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def substring_match(columns, term: str):
+    """
+    Case-insensitive "contains" across one or more columns (OR'ed).
+    LIKE wildcards in user input are matched literally.
+    """
+    pattern = f"%{_escape_like(term)}%"
+    return or_(*[column.ilike(pattern, escape="\\") for column in columns])
+
+
+def relevance(dialect_name: str, columns, term: str):
+    """
+    Ordering expression (best match first) for substring_match() results,
+    or None when the backend has no trigram similarity.
+    """
+    if dialect_name != "postgresql":
+        return None
+    # greatest() skips NULLs, so a coalition without a location still ranks
+    return func.greatest(*[func.similarity(column, term) for column in columns]).desc()
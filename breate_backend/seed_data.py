@@ -1,9 +1,10 @@
-from sqlalchemy.orm import Session
-from breate_backend.database import SessionLocal, engine, Base
-import models
+from sqlalchemy.dialects.postgresql import insert
 
-# Create tables if they don't exist
-Base.metadata.create_all(bind=engine)
+from breate_backend import models
+from breate_backend.database import engine, async_engine
+
+# Schema is managed by Alembic (`alembic upgrade head`); this module only
+# inserts reference rows and is safe to run any number of times.
 
 # Predefined Archetypes
 archetypes_data = [
@@ -44,31 +45,45 @@ tiers_data = [
     }
 ]
 
+# Predefined Coalitions
+coalitions_data = [
+    {
+        "name": "Climate Action Network",
+        "description": "A coalition focused on sustainable innovation and climate projects.",
+        "focus": "Climate Change",
+        "location": "Global",
+    },
+    {
+        "name": "Tech for Good",
+        "description": "Coalition uniting creators using technology to drive social impact.",
+        "focus": "Innovation",
+        "location": "Africa",
+    },
+]
 
-def seed_data():
-    db: Session = SessionLocal()
-    try:
-        # Seed Archetypes
-        for data in archetypes_data:
-            existing = db.query(models.Archetype).filter_by(name=data["name"]).first()
-            if not existing:
-                db.add(models.Archetype(**data))
 
-        # Seed Tiers
-        for data in tiers_data:
-            existing = db.query(models.Tier).filter_by(name=data["name"]).first()
-            if not existing:
-                db.add(models.Tier(**data))
+def seed_statements() -> list:
+    """
+    One bulk statement per table; rows that already exist are left alone.
+    """
+    return [
+        insert(models.Archetype).values(archetypes_data).on_conflict_do_nothing(index_elements=["name"]),
+        insert(models.Tier).values(tiers_data).on_conflict_do_nothing(index_elements=["name"]),
+        insert(models.Coalition).values(coalitions_data).on_conflict_do_nothing(index_elements=["name"]),
+    ]
 
-        db.commit()
-        print("✅ Archetypes and tiers seeded successfully!")
 
-    except Exception as e:
-        db.rollback()
-        print("❌ Error seeding data:", e)
+def seed_data():
+    with engine.begin() as conn:
+        for statement in seed_statements():
+            conn.execute(statement)
+    print("✅ Archetypes, tiers and coalitions seeded successfully!")
+
 
-    finally:
-        db.close()
+async def seed_data_async():
+    async with async_engine.begin() as conn:
+        for statement in seed_statements():
+            await conn.execute(statement)
 
 
 if __name__ == "__main__":
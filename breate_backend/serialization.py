@@ -0,0 +1,32 @@
+from functools import lru_cache
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+# ------------------------------------------
+# Fast path for large list responses
+# ------------------------------------------
+# Returning a Response from a route makes FastAPI skip its own response_model
+# validation and jsonable_encoder pass, so list endpoints validate once here
+# and hand plain Python objects to orjson. Keep `response_model=` on those
+# routes: it still documents the shape in OpenAPI.
+
+__all__ = ["ORJSONResponse", "type_adapter", "to_plain"]
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp) -> TypeAdapter:
+    """
+    TypeAdapter builds its validator and serializer on construction;
+    build one per type and reuse it.
+    """
+    return TypeAdapter(tp)
+
+
+def to_plain(tp, value):
+    """
+    Validates `value` against `tp` once (reading ORM attributes where needed)
+    and dumps it to dicts/lists that orjson can write without a custom default.
+    """
+    adapter = type_adapter(tp)
+    return adapter.dump_python(adapter.validate_python(value, from_attributes=True))
@@ -0,0 +1,68 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from breate_backend import models
+from breate_backend.cache import TTLCache
+
+# ------------------------------------------
+# Resolved current-user cache
+# ------------------------------------------
+# Authenticated routes resolve the token subject (email) to a user on every
+# request. Keep the resolved record briefly so most requests skip the
+# SELECT; writes to a user must call invalidate() with the user's email.
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 2048))
+
+_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Detached, read-only snapshot of the columns routes need from the current
+    user (never the password hash). Safe to share across requests/sessions.
+    """
+    id: int
+    email: str
+    username: Optional[str]
+    full_name: Optional[str]
+    archetype_id: Optional[int]
+    tier_id: Optional[int]
+
+
+async def resolve_user(db: AsyncSession, email: str) -> Optional[CachedUser]:
+    user = _cache.get(email)
+    if user is not None:
+        return user
+
+    query = select(
+        models.User.id,
+        models.User.email,
+        models.User.username,
+        models.User.full_name,
+        models.User.archetype_id,
+        models.User.tier_id,
+    ).where(models.User.email == email)
+    row = (await db.execute(query)).first()
+    if row is None:
+        return None  # not cached: the user may sign up a moment later
+
+    user = CachedUser(**row._mapping)
+    _cache.set(email, user)
+    return user
+
+
+def invalidate(email: str) -> None:
+    _cache.invalidate(email)
+
+
+def clear() -> None:
+    _cache.clear()
+
+
+def stats() -> dict:
+    return _cache.stats()
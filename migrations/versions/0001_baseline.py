@@ -0,0 +1,117 @@
+"""Baseline schema (what models.Base.metadata.create_all used to build)
+
+Databases that were created by create_all before migrations existed
+already have these tables: mark them with `alembic stamp 0001` and then
+run `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "archetypes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("description", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_archetypes_id", "archetypes", ["id"])
+
+    op.create_table(
+        "tiers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("level", sa.Integer(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_tiers_id", "tiers", ["id"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("bio", sa.Text(), nullable=True),
+        sa.Column("preferred_themes", sa.Text(), nullable=True),
+        sa.Column("portfolio_links", sa.Text(), nullable=True),
+        sa.Column("next_build", sa.Text(), nullable=True),
+        sa.Column("affiliations", sa.Text(), nullable=True),
+        sa.Column("archetype_id", sa.Integer(), sa.ForeignKey("archetypes.id"), nullable=True),
+        sa.Column("tier_id", sa.Integer(), sa.ForeignKey("tiers.id"), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "coalitions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("focus", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_coalitions_id", "coalitions", ["id"])
+
+    op.create_table(
+        "coalition_members",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("coalition_id", sa.Integer(), sa.ForeignKey("coalitions.id", ondelete="CASCADE"), nullable=True),
+    )
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("objective", sa.Text(), nullable=False),
+        sa.Column("project_type", sa.String(), nullable=False),
+        sa.Column("needed_archetypes", sa.Text(), nullable=False),
+        sa.Column("open_roles", sa.Text(), nullable=True),
+        sa.Column("timeline", sa.String(), nullable=True),
+        sa.Column("region", sa.String(), nullable=True),
+        sa.Column("coalition_tags", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("poster_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL"), nullable=True),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+
+    op.create_table(
+        "collab_links",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_a_username", sa.String(), sa.ForeignKey("users.username", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_b_username", sa.String(), sa.ForeignKey("users.username", ondelete="CASCADE"), nullable=False),
+        sa.Column("project_name", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("verified_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_collab_links_id", "collab_links", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("collab_links")
+    op.drop_table("projects")
+    op.drop_table("coalition_members")
+    op.drop_table("coalitions")
+    op.drop_table("users")
+    op.drop_table("tiers")
+    op.drop_table("archetypes")
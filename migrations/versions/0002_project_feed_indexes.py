@@ -0,0 +1,32 @@
+"""Composite indexes for the keyset-paginated project feed
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_projects_created_at_id", "projects", ["created_at", "id"])
+    op.create_index("ix_projects_region_created_at_id", "projects", ["region", "created_at", "id"])
+    op.create_index("ix_projects_type_created_at_id", "projects", ["project_type", "created_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_projects_type_created_at_id", table_name="projects")
+    op.drop_index("ix_projects_region_created_at_id", table_name="projects")
+    op.drop_index("ix_projects_created_at_id", table_name="projects")
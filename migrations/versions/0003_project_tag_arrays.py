@@ -0,0 +1,58 @@
+"""Store project archetypes and coalition tags as indexed varchar[] columns
+
+Converts the comma-joined Text columns in place (trimming whitespace and
+dropping empty entries) and adds GIN indexes so `@>` containment filters
+are index lookups.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _split(column: str) -> str:
+    return (
+        f"array_remove(regexp_split_to_array(btrim(coalesce({column}, '')), '\\s*,\\s*'), '')"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ("needed_archetypes", "coalition_tags"):
+        op.execute(
+            f"ALTER TABLE projects ALTER COLUMN {column} TYPE varchar[] USING {_split(column)}"
+        )
+        op.execute(f"ALTER TABLE projects ALTER COLUMN {column} SET DEFAULT '{{}}'")
+    op.execute("ALTER TABLE projects ALTER COLUMN coalition_tags SET NOT NULL")
+
+    op.create_index(
+        "ix_projects_needed_archetypes", "projects", ["needed_archetypes"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_projects_coalition_tags", "projects", ["coalition_tags"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_projects_coalition_tags", table_name="projects")
+    op.drop_index("ix_projects_needed_archetypes", table_name="projects")
+
+    op.execute("ALTER TABLE projects ALTER COLUMN coalition_tags DROP NOT NULL")
+    for column in ("needed_archetypes", "coalition_tags"):
+        op.execute(f"ALTER TABLE projects ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE projects ALTER COLUMN {column} TYPE text USING array_to_string({column}, ',')"
+        )
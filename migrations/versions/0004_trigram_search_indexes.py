@@ -0,0 +1,41 @@
+"""pg_trgm GIN indexes for substring search on users and coalitions
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ("ix_users_username_trgm", "users", "username"),
+    ("ix_coalitions_name_trgm", "coalitions", "name"),
+    ("ix_coalitions_focus_trgm", "coalitions", "focus"),
+    ("ix_coalitions_location_trgm", "coalitions", "location"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table)
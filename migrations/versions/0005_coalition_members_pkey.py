@@ -0,0 +1,45 @@
+"""Composite primary key on coalition_members
+
+Drops rows with a NULL side and duplicate memberships (keeping one),
+then adds PRIMARY KEY (coalition_id, user_id) plus an index on user_id.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DELETE FROM coalition_members WHERE user_id IS NULL OR coalition_id IS NULL")
+    op.execute(
+        """
+        DELETE FROM coalition_members a
+        USING coalition_members b
+        WHERE a.ctid < b.ctid
+          AND a.user_id = b.user_id
+          AND a.coalition_id = b.coalition_id
+        """
+    )
+    op.create_primary_key("coalition_members_pkey", "coalition_members", ["coalition_id", "user_id"])
+    op.create_index("ix_coalition_members_user_id", "coalition_members", ["user_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_coalition_members_user_id", table_name="coalition_members")
+    op.drop_constraint("coalition_members_pkey", "coalition_members", type_="primary")
+    op.alter_column("coalition_members", "user_id", nullable=True)
+    op.alter_column("coalition_members", "coalition_id", nullable=True)
@@ -0,0 +1,64 @@
+"""Canonical-pair storage and indexes for collab_links
+
+Collapses links stored in both directions (keeping a verified one, else
+the oldest), swaps the rest into code-point order so user_a <= user_b,
+then adds the unique pair constraint, a check enforcing the ordering
+and an index on user_b_username.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        DELETE FROM collab_links c
+        USING (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY least(user_a_username COLLATE "C", user_b_username COLLATE "C"),
+                                    greatest(user_a_username COLLATE "C", user_b_username COLLATE "C")
+                       ORDER BY (status = 'verified') DESC, id
+                   ) AS rn
+            FROM collab_links
+        ) d
+        WHERE c.id = d.id AND d.rn > 1
+        """
+    )
+    op.execute(
+        """
+        UPDATE collab_links
+        SET user_a_username = user_b_username, user_b_username = user_a_username
+        WHERE user_a_username > user_b_username COLLATE "C"
+        """
+    )
+    op.create_unique_constraint(
+        "uq_collab_links_pair", "collab_links", ["user_a_username", "user_b_username"]
+    )
+    op.create_check_constraint(
+        "ck_collab_links_canonical_pair", "collab_links",
+        'user_a_username <= user_b_username COLLATE "C"',
+    )
+    op.create_index("ix_collab_links_user_b_username", "collab_links", ["user_b_username"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_collab_links_user_b_username", table_name="collab_links")
+    op.drop_constraint("ck_collab_links_canonical_pair", "collab_links", type_="check")
+    op.drop_constraint("uq_collab_links_pair", "collab_links", type_="unique")
@@ -0,0 +1,51 @@
+"""Unique coalition names
+
+Merges coalitions that share a name into the oldest one (moving their
+members over), deletes the rest, then adds a unique constraint on
+coalitions.name so seeding can use ON CONFLICT (name) DO NOTHING.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE coalition_duplicates ON COMMIT DROP AS
+        SELECT id, min(id) OVER (PARTITION BY name) AS keep_id
+        FROM coalitions
+        """
+    )
+    op.execute("DELETE FROM coalition_duplicates WHERE id = keep_id")
+    op.execute(
+        """
+        INSERT INTO coalition_members (coalition_id, user_id)
+        SELECT d.keep_id, m.user_id
+        FROM coalition_members m
+        JOIN coalition_duplicates d ON d.id = m.coalition_id
+        ON CONFLICT DO NOTHING
+        """
+    )
+    # Remaining memberships of the duplicates go with them (ON DELETE CASCADE)
+    op.execute("DELETE FROM coalitions c USING coalition_duplicates d WHERE c.id = d.id")
+    op.create_unique_constraint("uq_coalitions_name", "coalitions", ["name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_coalitions_name", "coalitions", type_="unique")
@@ -0,0 +1,33 @@
+"""projects.created_at NOT NULL
+
+The project feed pages on (created_at, id) and encodes created_at into its
+cursor, so the column may not be NULL. Rows without one are backfilled with
+the epoch, which places them at the end of the feed.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE projects SET created_at = 'epoch' WHERE created_at IS NULL")
+    op.alter_column("projects", "created_at", nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column("projects", "created_at", nullable=True)
@@ -0,0 +1,76 @@
+"""
+CompressionMiddleware on a bare Starlette app (no database needed):
+    python -m pytest tests/test_compression.py
+"""
+import gzip
+import json
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from breate_backend.compression import CompressionMiddleware
+from breate_backend.http_cache import conditional_response, make_etag
+
+LARGE = json.dumps([{"id": i, "name": f"Coalition {i}", "focus": "Climate Change"} for i in range(500)]).encode()
+SMALL = json.dumps({"status": "ok"}).encode()
+
+
+def _route(body: bytes):
+    async def endpoint(request: Request):
+        return conditional_response(request, body, make_etag(body), "no-cache")
+
+    return endpoint
+
+
+app = Starlette(routes=[Route("/large", _route(LARGE)), Route("/small", _route(SMALL))])
+app.add_middleware(CompressionMiddleware)
+client = TestClient(app)
+
+
+def test_large_json_is_gzipped():
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(LARGE)
+    assert response.num_bytes_downloaded == int(response.headers["content-length"])
+    assert response.content == LARGE  # httpx decodes it
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"] == make_etag(LARGE)[:-1] + '-gzip"'
+
+
+def test_identity_when_not_accepted():
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.num_bytes_downloaded == len(LARGE)
+    assert response.headers["etag"] == make_etag(LARGE)
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_small_body_is_not_compressed():
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == SMALL
+
+
+def test_suffixed_etag_revalidates_to_304():
+    etag = client.get("/large", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == b""
+
+
+def test_raw_body_is_gzip_of_the_identity_body():
+    with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert len(raw) < len(LARGE)
+    assert gzip.decompress(raw) == LARGE
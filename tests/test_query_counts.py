@@ -0,0 +1,152 @@
+"""
+Statement counts of the list endpoints must not grow with the result size.
+
+Needs a migrated Postgres (`alembic upgrade head`) in DATABASE_URL:
+    python -m pytest tests/test_query_counts.py
+
+Rows are inserted under a scratch archetype/region so each call returns
+exactly the rows the test created, then removed again.
+"""
+import os
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event, insert
+
+from breate_backend import models
+from breate_backend.database import async_engine, engine
+from breate_backend.routers import coalitions, discover, projects
+
+SIZES = (1, 25)
+
+# Just the routers under test: main.app's startup tasks would query the
+# database concurrently and skew the counts
+app = FastAPI()
+app.include_router(discover.router, prefix="/api/v1")
+app.include_router(coalitions.router, prefix="/api/v1")
+app.include_router(projects.router, prefix="/api/v1")
+
+# Mounted as in main.py, where discover's own /api/v1 prefix doubles up
+DISCOVER_URL = "/api/v1/api/v1/discover/"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def scratch():
+    """Unique tag for this test's rows; deletes them afterwards."""
+    tag = f"qc-{uuid4().hex[:12]}"
+    yield tag
+    with engine.begin() as conn:
+        conn.execute(delete(models.Project).where(models.Project.region == tag))
+        conn.execute(delete(models.Coalition).where(models.Coalition.location == tag))
+        conn.execute(delete(models.User).where(models.User.email.like(f"{tag}-%")))
+        conn.execute(delete(models.Archetype).where(models.Archetype.name == tag))
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Routers run on either engine depending on DB_ASYNC
+    targets = [engine, async_engine.sync_engine]
+    for target in targets:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in targets:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+
+def statements_per_size(client, url: str, add_rows) -> dict[int, int]:
+    """Statement count of GET `url` after growing the result to each size."""
+    client.get(url)  # warm the reference data cache
+    counts, added = {}, 0
+    for size in SIZES:
+        add_rows(size - added)
+        added = size
+        with count_statements() as statements:
+            response = client.get(url)
+        assert response.status_code == 200
+        counts[size] = len(statements)
+    assert all(counts.values()), "no statements seen: listener not attached to the engine in use"
+    return counts
+
+
+def test_discover_statement_count_is_fixed(client, scratch):
+    with engine.begin() as conn:
+        archetype_id = conn.execute(
+            insert(models.Archetype).values(name=scratch).returning(models.Archetype.id)
+        ).scalar_one()
+    created = []
+
+    def add_users(n):
+        rows = [
+            {
+                "email": f"{scratch}-{len(created) + i}@example.com",
+                "username": f"{scratch}-{len(created) + i}",
+                "password": "x",
+                "archetype_id": archetype_id,
+                "tier_id": None,
+            }
+            for i in range(n)
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(models.User), rows)
+        created.extend(rows)
+
+    counts = statements_per_size(client, f"{DISCOVER_URL}?archetype_id={archetype_id}", add_users)
+    assert len(client.get(f"{DISCOVER_URL}?archetype_id={archetype_id}").json()) == SIZES[-1]
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_coalition_list_statement_count_is_fixed(client, scratch):
+    created = []
+
+    def add_coalitions(n):
+        rows = [{"name": f"{scratch}-{len(created) + i}", "location": scratch} for i in range(n)]
+        with engine.begin() as conn:
+            conn.execute(insert(models.Coalition), rows)
+        created.extend(rows)
+
+    counts = statements_per_size(client, f"/api/v1/coalitions/?region={scratch}", add_coalitions)
+    assert len(client.get(f"/api/v1/coalitions/?region={scratch}").json()) == SIZES[-1]
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_project_list_statement_count_is_fixed(client, scratch):
+    created = []
+
+    def add_projects(n):
+        rows = [
+            {
+                "title": f"{scratch}-{len(created) + i}",
+                "objective": "Query count regression test",
+                "project_type": "Test",
+                "region": scratch,
+            }
+            for i in range(n)
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(models.Project), rows)
+        created.extend(rows)
+
+    url = f"/api/v1/projects/?region={scratch}&limit=100"
+    counts = statements_per_size(client, url, add_projects)
+    assert len(client.get(url).json()["items"]) == SIZES[-1]
+    assert len(set(counts.values())) == 1, counts